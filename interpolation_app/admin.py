@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import InterpolationPoint, InterpolationSet, LagrangeResult
+from .signals import refresh_compiled
 
 
 class InterpolationPointInline(admin.TabularInline):
@@ -26,6 +27,11 @@ class InterpolationSetAdmin(admin.ModelAdmin):
     def get_points_count(self, obj):
         return obj.points.count()
     get_points_count.short_description = 'Points Count'
+    
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # The inline edits the through table directly, which sends no m2m_changed signal
+        refresh_compiled(form.instance)
 
 
 @admin.register(LagrangeResult)
@@ -0,0 +1,251 @@
+"""
+Cost-based admission control for interpolation requests
+A request's cost approximates its floating-point work: n^2 for weights and coefficients,
+n*m for evaluating m points, plus animation and term details. Cheap requests are admitted
+at once, heavy ones share a small concurrency lane (per process), and requests over the
+budget, or whose response would carry too many values, are rejected (INTERPOLATION_ADMISSION)
+"""
+import math
+import threading
+
+from django.conf import settings
+
+# Animation frames sample at most this many partial interpolants on a 100-point grid
+ANIMATION_STEPS = 50
+ANIMATION_GRID_POINTS = 100
+
+
+def admission_config() -> dict:
+    """Admission settings with defaults filled in"""
+    config = {
+        'ENABLED': True,
+        'LIGHT_MAX_COST': 1e8,
+        'MAX_COST': 1e10,
+        'HEAVY_CONCURRENCY': 2,
+        'HEAVY_TIMEOUT': 0.0,
+        'COST_PER_SECOND': 2e8,
+        'MAX_RESPONSE_VALUES': 1e6,
+    }
+    config.update(getattr(settings, 'INTERPOLATION_ADMISSION', {}))
+    return config
+
+
+def grid_size(data: dict) -> int:
+    """Number of x values a validated /api/interpolate/ request evaluates at (at most, if adaptive)"""
+    x_values = data.get('x_values')
+    if x_values is not None and len(x_values):
+        return len(x_values)
+    if data.get('sampling') == 'adaptive':
+        return data['max_samples']
+    return data.get('num_points', 100)
+
+
+def request_cost(data: dict) -> float:
+    """Estimated work of a validated /api/interpolate/ request"""
+    n = len(data['points'])
+    include = data.get('include', ())
+    m = grid_size(data)
+    evaluated = 'evaluation' in include or data.get('derivative_order') or data.get('stream')
+
+    if data.get('mode') == 'piecewise':
+        window = min(data['local_degree'], n - 1) + 1
+        return n * math.log2(n) + (m * window * window if evaluated else 0)
+
+    # Barycentric weights
+    cost = n * n
+    if 'coefficients' in include or data.get('basis') == 'chebyshev':
+        cost += n * n
+    if evaluated:
+        cost += n * m
+    if data.get('derivative_order'):
+        cost += data['derivative_order'] * n * n + n * m
+    if data.get('integral_bounds'):
+        cost += n * n + len(data['integral_bounds']) * n
+    if 'animation' in include:
+        steps = min(ANIMATION_STEPS, n)
+        cost += steps * ANIMATION_GRID_POINTS + steps * steps
+    if 'terms' in include:
+        terms = max(0, n - data.get('terms_offset', 0))
+        if data.get('terms_limit') is not None:
+            terms = min(terms, data['terms_limit'])
+        cost += terms * n
+    return float(cost)
+
+
+def response_values(data: dict) -> int:
+    """
+    Estimated number of values in the response body of a validated /api/interpolate/ request
+    Streamed grids are sent in fixed-size chunks and are not counted
+    """
+    include = data.get('include', ())
+    values = 2 * len(data['points'])
+    if data.get('stream'):
+        return values
+    m = grid_size(data)
+    if 'evaluation' in include or data.get('derivative_order'):
+        values += 2 * m
+    if data.get('derivative_order'):
+        values += m
+    if 'animation' in include:
+        values += min(ANIMATION_STEPS, len(data['points'])) * ANIMATION_GRID_POINTS
+    return values
+
+
+class AdmissionRejected(Exception):
+    """
+    A request was refused; carries the HTTP status, the cost, an optional Retry-After in seconds
+    and, for oversized responses, the estimated number of response values
+    """
+
+    def __init__(self, status_code: int, detail: str, cost: float, retry_after: int = None,
+                 values: int = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.cost = cost
+        self.retry_after = retry_after
+        self.values = values
+
+    def as_dict(self) -> dict:
+        config = admission_config()
+        body = {'error': self.detail, 'cost': self.cost, 'max_cost': config['MAX_COST']}
+        if self.values is not None:
+            body.update(response_values=self.values, max_response_values=config['MAX_RESPONSE_VALUES'])
+        return body
+
+
+class Ticket:
+    """Admission to the light or heavy lane; release() (or leaving the `with` block) frees a heavy slot"""
+
+    def __init__(self, lane=None):
+        self._lane = lane
+        self._lock = threading.Lock()
+
+    @property
+    def heavy(self) -> bool:
+        return self._lane is not None
+
+    def release(self):
+        with self._lock:
+            lane, self._lane = self._lane, None
+        if lane is not None:
+            lane.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def wrap(self, iterable):
+        """Hold the ticket until a streamed response is exhausted or closed"""
+        return _ReleasingIterator(iterable, self.release)
+
+
+class _ReleasingIterator:
+    # Django calls close() on streaming content when the response is closed, even if never iterated
+    def __init__(self, iterable, release):
+        self._iterator = iter(iterable)
+        self._release = release
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        close = getattr(self._iterator, 'close', None)
+        if close is not None:
+            close()
+        self._release()
+
+
+class AdmissionController:
+    """Per-process heavy lane plus counters for /debug/"""
+
+    def __init__(self):
+        self._lane = None
+        self._lane_size = None
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.heavy = 0
+        self.rejected = 0
+        self.throttled = 0
+
+    def _heavy_lane(self, size: int):
+        with self._lock:
+            if self._lane is None or self._lane_size != size:
+                self._lane = threading.BoundedSemaphore(size)
+                self._lane_size = size
+            return self._lane
+
+    def retry_after(self, cost: float, config: dict) -> int:
+        return max(1, math.ceil(cost / config['COST_PER_SECOND']))
+
+    def admit(self, cost: float, values: int = 0) -> Ticket:
+        """
+        Admit a request of the given cost and response size (number of values) or raise
+        AdmissionRejected (413 over budget or too large, 429 lane full)
+        """
+        config = admission_config()
+        if not config['ENABLED']:
+            self.admitted += 1
+            return Ticket()
+
+        if values > config['MAX_RESPONSE_VALUES']:
+            self.rejected += 1
+            raise AdmissionRejected(
+                413,
+                f"Response too large (estimated {values} values exceeds {config['MAX_RESPONSE_VALUES']:.3g}); "
+                "evaluate fewer points or stream the grid.",
+                cost,
+                values=values
+            )
+
+        if cost <= config['LIGHT_MAX_COST']:
+            self.admitted += 1
+            return Ticket()
+
+        if cost > config['MAX_COST']:
+            self.rejected += 1
+            raise AdmissionRejected(
+                413,
+                f"Request too expensive (estimated cost {cost:.3g} exceeds {config['MAX_COST']:.3g}); "
+                "use fewer points, a smaller grid, piecewise mode or fewer sections.",
+                cost
+            )
+
+        lane = self._heavy_lane(config['HEAVY_CONCURRENCY'])
+        if not lane.acquire(timeout=config['HEAVY_TIMEOUT']):
+            self.throttled += 1
+            raise AdmissionRejected(
+                429,
+                'Too many expensive interpolation requests in progress; retry later.',
+                cost,
+                retry_after=self.retry_after(cost, config)
+            )
+        self.admitted += 1
+        self.heavy += 1
+        return Ticket(lane)
+
+    def stats(self) -> dict:
+        config = admission_config()
+        return {
+            'enabled': config['ENABLED'],
+            'light_max_cost': config['LIGHT_MAX_COST'],
+            'max_cost': config['MAX_COST'],
+            'max_response_values': config['MAX_RESPONSE_VALUES'],
+            'heavy_concurrency': config['HEAVY_CONCURRENCY'],
+            'admitted': self.admitted,
+            'heavy': self.heavy,
+            'rejected': self.rejected,
+            'throttled': self.throttled,
+        }
+
+
+admission = AdmissionController()
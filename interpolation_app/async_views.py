@@ -0,0 +1,201 @@
+"""
+Async versions of the interpolation endpoints for ASGI deployments
+Parsing, validation, the numeric work and rendering run in a bounded executor
+(ASYNC_INTERPOLATION), and database access uses the async ORM, so the event loop
+keeps serving other requests while an interpolation computes
+"""
+import asyncio
+import io
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from .admission import AdmissionRejected, admission
+from .cache import live_interpolators
+from .lagrange import LagrangeInterpolator
+from .models import InterpolationSet, LagrangeResult
+from .parsers import binary_parser_classes
+from .renderers import ArrayJSONRenderer, binary_renderer_classes
+from .serializers import InterpolationRequestSerializer, InterpolationSectionsSerializer
+from .views import (
+    InterpolationAPIView,
+    get_live_interpolator,
+    set_interpolation_response,
+    set_interpolation_sections
+)
+
+PARSERS = {parser.media_type: parser for parser in [JSONParser] + binary_parser_classes()}
+RENDERERS = [ArrayJSONRenderer] + binary_renderer_classes()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """The shared executor for numeric work, created on first use from ASYNC_INTERPOLATION"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            config = getattr(settings, 'ASYNC_INTERPOLATION', {})
+            max_workers = config.get('MAX_WORKERS', 4)
+            if config.get('EXECUTOR', 'thread') == 'process':
+                _executor = ProcessPoolExecutor(max_workers=max_workers, initializer=django.setup)
+            else:
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='interpolation')
+        return _executor
+
+
+async def run_in_executor(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), function, *args)
+
+
+def select_renderer(accept: str):
+    """First renderer whose media type the Accept header names, JSON otherwise"""
+    for renderer in RENDERERS:
+        if renderer.media_type in (accept or ''):
+            return renderer
+    return ArrayJSONRenderer
+
+
+def render(renderer, data, status_code, headers=None):
+    """(status, body bytes, content type, headers) for the given renderer class"""
+    return status_code, renderer().render(data), renderer.media_type, headers or {}
+
+
+def with_query_sections(payload, include):
+    """
+    Add the ?include= query value to a parsed body that names no sections itself,
+    as SectionsField does for the DRF views (which have the request in the serializer context)
+    """
+    if include is not None and isinstance(payload, dict) and 'include' not in payload:
+        payload['include'] = include
+    return payload
+
+
+def interpolate_payload(content_type: str, body: bytes, renderer, include=None):
+    """
+    Parse, validate, compute and render one /api/interpolate/ request body
+    `include` is the ?include= query value, if any
+    Runs in the executor; returns (status, body bytes, content type, headers)
+    """
+    parser = PARSERS.get(content_type, JSONParser)
+    try:
+        payload = with_query_sections(parser().parse(io.BytesIO(body)), include)
+    except ParseError as e:
+        return render(renderer, {'detail': str(e.detail)}, 400)
+
+    serializer = InterpolationRequestSerializer(data=payload)
+    if not serializer.is_valid():
+        return render(renderer, serializer.errors, 400)
+    data = serializer.validated_data
+    if data['stream']:
+        return render(renderer, {'stream': ['Streaming is only available from /api/interpolate/.']}, 400)
+
+    try:
+        ticket = admission.admit(serializer.cost, serializer.response_values)
+    except AdmissionRejected as e:
+        headers = {'Retry-After': str(e.retry_after)} if e.retry_after is not None else None
+        return render(renderer, e.as_dict(), e.status_code, headers)
+
+    with ticket:
+        try:
+            response_data = InterpolationAPIView().interpolation_result(data)[0]
+        except Exception as e:
+            return render(renderer, {'error': str(e)}, 500)
+        return render(renderer, response_data, 200)
+
+
+def compute_set_sections(interpolator, options, params):
+    """Executor task: compute the set sections and re-check the live cache budget"""
+    sections = set_interpolation_sections(interpolator, options, params)
+    live_interpolators.trim()
+    return sections
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncInterpolationView(View):
+    """
+    Async counterpart of InterpolationAPIView (JSON, .npz or msgpack; no streaming or response cache)
+    """
+    http_method_names = ['post']
+
+    async def post(self, request):
+        renderer = select_renderer(request.headers.get('Accept'))
+        status_code, content, content_type, headers = await run_in_executor(
+            interpolate_payload, request.content_type, request.body, renderer, request.GET.get('include')
+        )
+        return HttpResponse(content, content_type=content_type, status=status_code, headers=headers)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncInterpolationSetView(View):
+    """
+    Async counterpart of the InterpolationSetViewSet interpolate action (JSON only)
+    """
+    http_method_names = ['post']
+
+    async def post(self, request, pk):
+        try:
+            params = JSONParser().parse(io.BytesIO(request.body)) if request.body else {}
+        except ParseError as e:
+            return self.json_response({'detail': str(e.detail)}, 400)
+        if not isinstance(params, dict):
+            return self.json_response({'detail': 'Expected a JSON object.'}, 400)
+        params = with_query_sections(params, request.GET.get('include'))
+
+        try:
+            interpolation_set = await InterpolationSet.objects.aget(pk=pk)
+        except InterpolationSet.DoesNotExist:
+            return self.json_response({'detail': 'Not found.'}, 404)
+
+        sections_serializer = InterpolationSectionsSerializer(data=params)
+        if not sections_serializer.is_valid():
+            return self.json_response(sections_serializer.errors, 400)
+        include = sections_serializer.validated_data['include']
+
+        try:
+            if interpolation_set.compiled_data is not None:
+                interpolator = get_live_interpolator(interpolation_set)
+            else:
+                # Uncompiled sets are compiled (a database write) on first use
+                interpolator = await sync_to_async(get_live_interpolator)(interpolation_set)
+            if interpolator is None:
+                points = [point async for point in interpolation_set.points.order_by('x').values_list('x', 'y')]
+                if len(points) < 2:
+                    return self.json_response({'error': 'At least 2 points are required for interpolation'}, 400)
+                # Surfaces the reason the stored points cannot be interpolated (e.g. duplicates)
+                LagrangeInterpolator(points)
+
+            sections = await run_in_executor(
+                compute_set_sections, interpolator, sections_serializer.validated_data, params
+            )
+
+            # Polynomial coefficients are stored on the set once per version of its points
+            if 'coefficients' in include and not interpolation_set.compiled_coefficients:
+                await interpolation_set.astore_coefficients(sections['coefficients'])
+
+            # Save result
+            result = LagrangeResult(interpolation_set=interpolation_set)
+            result.set_coefficients(sections['coefficients'])
+            result.set_evaluation_data(sections['x_values'], sections['y_values'])
+            await result.asave()
+
+            response_data = set_interpolation_response(result.id, sections, include)
+            status_code, content, content_type, _ = await run_in_executor(render, JSONRenderer, response_data, 200)
+            return HttpResponse(content, content_type=content_type, status=status_code)
+
+        except Exception as e:
+            return self.json_response({'error': str(e)}, 500)
+
+    def json_response(self, data, status_code):
+        return HttpResponse(JSONRenderer().render(data), content_type=JSONRenderer.media_type, status=status_code)
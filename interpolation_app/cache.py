@@ -0,0 +1,184 @@
+"""
+Caching for interpolation: an in-process LRU cache of built interpolators and
+a response cache of rendered /api/interpolate/ bytes on Django's cache framework
+"""
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+
+from .lagrange import LagrangeInterpolator
+
+
+def points_fingerprint(points) -> str:
+    """
+    Canonical hash of a point set: SHA-256 of the points sorted by x as float64
+    The same points in any order (and -0.0 vs 0.0) give the same fingerprint
+    """
+    data = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    data = data[np.argsort(data[:, 0], kind='stable')] + 0.0
+    return hashlib.sha256(np.ascontiguousarray(data).tobytes()).hexdigest()
+
+
+def live_key(interpolation_set) -> tuple:
+    """
+    Key of a stored set's live interpolator: the set id and a digest of its compiled data
+    An entry always matches the data it is found with, so interpolators built in rolled-back
+    transactions cannot be served again when compiled_version numbers are reused
+    """
+    digest = hashlib.blake2b(bytes(interpolation_set.compiled_data), digest_size=16).hexdigest()
+    return interpolation_set.pk, digest
+
+
+class InterpolatorCache:
+    """
+    Thread-safe LRU cache of interpolators with entry-count and memory-based eviction
+    Memoized derived data (coefficients, animation frames) lives on the interpolators,
+    so their footprint is re-measured whenever eviction is checked
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached interpolator for `key` (marking it recently used), or None"""
+        with self._lock:
+            interpolator = self._entries.get(key)
+            if interpolator is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return interpolator
+
+    def put(self, key, interpolator):
+        """Store an interpolator and evict least recently used entries over the limits"""
+        with self._lock:
+            self._entries[key] = interpolator
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_or_build(self, points) -> LagrangeInterpolator:
+        """Return the cached interpolator for these points, building and caching it on a miss"""
+        key = points_fingerprint(points)
+        interpolator = self.get(key)
+        if interpolator is None:
+            # Built outside the lock; concurrent misses for the same key are harmless
+            interpolator = LagrangeInterpolator(points)
+            self.put(key, interpolator)
+        return interpolator
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes()
+
+    def _total_bytes(self) -> int:
+        return sum(interpolator.memory_footprint() for interpolator in self._entries.values())
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        # Keep at least the most recent entry even if it alone exceeds the byte budget
+        while len(self._entries) > 1 and self._total_bytes() > self.max_bytes:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def trim(self):
+        """Re-measure entries (their memoized data may have grown) and evict over the budget"""
+        with self._lock:
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes(),
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+_cache_config = getattr(settings, 'INTERPOLATOR_CACHE', {})
+
+# Interpolators for ad-hoc point sets, keyed by points_fingerprint()
+interpolator_cache = InterpolatorCache(
+    max_entries=_cache_config.get('MAX_ENTRIES', 256),
+    max_bytes=_cache_config.get('MAX_BYTES', 64 * 1024 * 1024),
+)
+
+# Live interpolators for stored interpolation sets, keyed by live_key()
+live_interpolators = InterpolatorCache(
+    max_entries=_cache_config.get('LIVE_MAX_ENTRIES', 128),
+    max_bytes=_cache_config.get('MAX_BYTES', 64 * 1024 * 1024),
+)
+
+
+def response_cache_config() -> dict:
+    """Response cache settings with defaults filled in"""
+    config = {
+        'ENABLED': False,
+        'ALIAS': 'default',
+        'TIMEOUT': 300,
+        'MAX_BYTES': 1024 * 1024,
+        'KEY_PREFIX': 'interpolate-response',
+    }
+    config.update(getattr(settings, 'INTERPOLATION_RESPONSE_CACHE', {}))
+    return config
+
+
+def response_cache_key(data: dict, media_type: str = '') -> str:
+    """
+    Canonical digest of a validated interpolation request and the negotiated media type
+    Float arrays are hashed as float64 bytes; the remaining options as sorted JSON
+    """
+    digest = hashlib.sha256()
+    for field in ('points', 'x_values'):
+        values = data.get(field)
+        values = np.asarray(values if values is not None else [], dtype=np.float64) + 0.0
+        digest.update(field.encode())
+        digest.update(str(values.shape).encode())
+        digest.update(np.ascontiguousarray(values).tobytes())
+    options = {
+        key: value for key, value in data.items()
+        if key not in ('points', 'x_values', 'name', 'description')
+    }
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+    digest.update(media_type.encode())
+    return f"{response_cache_config()['KEY_PREFIX']}:{digest.hexdigest()}"
+
+
+def get_cached_response(key):
+    """Return (content bytes, content type) for a cached response, or None"""
+    config = response_cache_config()
+    return caches[config['ALIAS']].get(key)
+
+
+def store_response(key, content: bytes, content_type: str) -> bool:
+    """Store rendered response bytes unless they exceed MAX_BYTES; returns whether stored"""
+    config = response_cache_config()
+    if len(content) > config['MAX_BYTES']:
+        return False
+    caches[config['ALIAS']].set(key, (bytes(content), content_type), config['TIMEOUT'])
+    return True
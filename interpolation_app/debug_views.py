@@ -46,4 +46,19 @@ def debug_info(request):
     except Exception as e:
         debug_data["settings_error"] = str(e)
     
+    try:
+        from interpolation_app.cache import interpolator_cache, live_interpolators
+        debug_data["interpolator_cache"] = {
+            "points": interpolator_cache.stats(),
+            "sets": live_interpolators.stats(),
+        }
+    except Exception as e:
+        debug_data["interpolator_cache_error"] = str(e)
+
+    try:
+        from interpolation_app.admission import admission
+        debug_data["admission"] = admission.stats()
+    except Exception as e:
+        debug_data["admission_error"] = str(e)
+
     return JsonResponse(debug_data, safe=False)
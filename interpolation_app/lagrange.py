@@ -1,6 +1,35 @@
+import math
+import os
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from typing import List, Tuple
 
+# Upper bound on the number of elements in the (block, n) temporaries used by the
+# vectorized evaluation path; 2**16 float64 values keep each block around 512 KiB
+EVAL_BLOCK_ELEMENTS = 2 ** 16
+
+# Largest estimated Vandermonde condition number for which monomial coefficients are returned;
+# beyond it the Bjorck-Pereyra solution stops reproducing the data (measured: relative residuals
+# stay below 1e-8 up to 1e24 on equispaced, Chebyshev and random nodes, and reach O(1) soon after)
+MAX_MONOMIAL_CONDITION = 1e24
+
+# Output precisions selectable for evaluation results; computation always runs in float64
+PRECISIONS = {
+    'float32': np.float32,
+    'float64': np.float64,
+}
+
+def resolve_precision(precision) -> np.dtype:
+    """
+    Map a precision name ('float32' / 'float64') or dtype to a NumPy dtype
+    """
+    if isinstance(precision, str):
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unsupported precision '{precision}'. Choose one of {sorted(PRECISIONS)}.")
+        return np.dtype(PRECISIONS[precision])
+    return np.dtype(precision)
+
 def format_decimal_to_2_places(num: float) -> float:
     """
     Format a decimal number to exactly 2 decimal places
@@ -18,34 +47,522 @@ def format_coefficient_for_display(coeff: float) -> float:
     # Otherwise, round to 2 decimal places
     return format_decimal_to_2_places(coeff)
 
+def barycentric_evaluate(nodes: np.ndarray, values: np.ndarray, weights: np.ndarray, x_values,
+                         dtype=np.float64, out: np.ndarray = None) -> np.ndarray:
+    """
+    Vectorized barycentric (second form) evaluation at an array of x values
+    The grid is processed in blocks so the (block, n) temporaries stay cache-sized;
+    results are written straight into `out` or a new array of the requested dtype
+    """
+    x = np.asarray(x_values, dtype=float)
+    flat = x.ravel()
+    result = np.empty(flat.shape[0], dtype=resolve_precision(dtype)) if out is None else out.reshape(-1)
+    block = max(1, EVAL_BLOCK_ELEMENTS // len(nodes))
+    
+    for start in range(0, flat.shape[0], block):
+        chunk = flat[start:start + block]
+        diff = chunk[:, None] - nodes[None, :]
+        exact_rows, exact_cols = np.nonzero(diff == 0)
+        diff[exact_rows, exact_cols] = 1.0
+        terms = weights / diff
+        with np.errstate(divide='ignore', invalid='ignore'):
+            block_values = (terms @ values) / terms.sum(axis=1)
+        # Queries that coincide with a node take the node value directly
+        block_values[exact_rows] = values[exact_cols]
+        result[start:start + block] = block_values
+    
+    return result.reshape(x.shape)
+
+def evaluate_many(x_nodes, y_nodes, x_grid, dtype=np.float64) -> np.ndarray:
+    """
+    Evaluate many independent interpolants of the same size on one shared grid
+    x_nodes and y_nodes have shape (sets, n) and x_grid shape (m,); returns a (sets, m) array.
+    Weights for all sets are built in one vectorized pass and evaluation runs in blocks over
+    sets and grid points, with no per-set Python objects
+    """
+    x_nodes = np.atleast_2d(np.asarray(x_nodes, dtype=float))
+    y_nodes = np.atleast_2d(np.asarray(y_nodes, dtype=float))
+    grid = np.asarray(x_grid, dtype=float).ravel()
+    if x_nodes.shape != y_nodes.shape:
+        raise ValueError("x and y node arrays must have the same (sets, n) shape")
+    sets, n = x_nodes.shape
+    if n < 2:
+        raise ValueError("At least 2 points are required for interpolation")
+    
+    duplicate_sets = np.flatnonzero(np.any(np.diff(np.sort(x_nodes, axis=1), axis=1) == 0, axis=1))
+    if duplicate_sets.size:
+        raise ValueError(f"Duplicate x-coordinates found in sets {duplicate_sets.tolist()}. Each x-coordinate must be unique for interpolation.")
+    
+    result = np.empty((sets, grid.shape[0]), dtype=resolve_precision(dtype))
+    set_block = max(1, min(sets, EVAL_BLOCK_ELEMENTS // (n * n)))
+    
+    for s0 in range(0, sets, set_block):
+        nodes = x_nodes[s0:s0 + set_block]
+        values = y_nodes[s0:s0 + set_block]
+        
+        # Scaled barycentric weights for the whole block of sets, as in LagrangeInterpolator
+        scale = (nodes.max(axis=1) - nodes.min(axis=1))[:, None, None] / 4.0
+        differences = (nodes[:, :, None] - nodes[:, None, :]) / scale
+        differences[:, np.arange(n), np.arange(n)] = 1.0
+        weights = 1.0 / np.prod(differences, axis=2)
+        
+        grid_block = max(1, EVAL_BLOCK_ELEMENTS // (n * nodes.shape[0]))
+        for g0 in range(0, grid.shape[0], grid_block):
+            chunk = grid[g0:g0 + grid_block]
+            diff = chunk[None, :, None] - nodes[:, None, :]
+            exact = np.nonzero(diff == 0)
+            diff[exact] = 1.0
+            terms = weights[:, None, :] / diff
+            with np.errstate(divide='ignore', invalid='ignore'):
+                block_values = np.einsum('smn,sn->sm', terms, values) / terms.sum(axis=2)
+            # Grid points that coincide with a node take the node value directly
+            block_values[exact[0], exact[1]] = values[exact[0], exact[2]]
+            result[s0:s0 + set_block, g0:g0 + grid_block] = block_values
+    
+    return result
+
+# Grids smaller than this are evaluated in-process; pool start-up would dominate
+PARALLEL_MIN_POINTS = 2 ** 20
+
+def _evaluate_shared_chunk(model_name: str, n: int, grid_name: str, output_name: str, size: int,
+                           dtype: str, start: int, stop: int) -> None:
+    """
+    Worker task: evaluate grid[start:stop] from shared memory into the shared output buffer
+    Only the segment names and bounds are pickled per chunk
+    """
+    model_shm = shared_memory.SharedMemory(name=model_name)
+    grid_shm = shared_memory.SharedMemory(name=grid_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    try:
+        model = np.ndarray((3, n), dtype=np.float64, buffer=model_shm.buf)
+        grid = np.ndarray((size,), dtype=np.float64, buffer=grid_shm.buf)
+        output = np.ndarray((size,), dtype=dtype, buffer=output_shm.buf)
+        barycentric_evaluate(model[0], model[1], model[2], grid[start:stop], dtype, out=output[start:stop])
+        del model, grid, output
+    finally:
+        model_shm.close()
+        grid_shm.close()
+        output_shm.close()
+
+def parallel_evaluate(nodes: np.ndarray, values: np.ndarray, weights: np.ndarray, x_values,
+                      workers: int = None, dtype=np.float64, executor: ProcessPoolExecutor = None) -> np.ndarray:
+    """
+    Evaluate a huge grid across a process pool
+    Nodes, values and weights are placed in one shared-memory segment, the grid in another,
+    and workers write their slices straight into a shared output buffer
+    """
+    dtype = resolve_precision(dtype)
+    x = np.asarray(x_values, dtype=float)
+    flat = x.ravel()
+    size = flat.shape[0]
+    workers = workers or os.cpu_count() or 1
+    if size < PARALLEL_MIN_POINTS or workers == 1:
+        return barycentric_evaluate(nodes, values, weights, x, dtype)
+    
+    n = len(nodes)
+    segments = []
+    try:
+        model_shm = shared_memory.SharedMemory(create=True, size=3 * n * 8)
+        segments.append(model_shm)
+        grid_shm = shared_memory.SharedMemory(create=True, size=size * 8)
+        segments.append(grid_shm)
+        output_shm = shared_memory.SharedMemory(create=True, size=size * dtype.itemsize)
+        segments.append(output_shm)
+        
+        model = np.ndarray((3, n), dtype=np.float64, buffer=model_shm.buf)
+        model[0], model[1], model[2] = nodes, values, weights
+        grid = np.ndarray((size,), dtype=np.float64, buffer=grid_shm.buf)
+        grid[:] = flat
+        
+        # A few chunks per worker keeps the pool balanced without per-chunk copies
+        chunk = -(-size // (workers * 4))
+        tasks = [
+            (model_shm.name, n, grid_shm.name, output_shm.name, size, dtype.name, start, min(start + chunk, size))
+            for start in range(0, size, chunk)
+        ]
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [pool.submit(_evaluate_shared_chunk, *task) for task in tasks]
+            for future in futures:
+                future.result()
+        finally:
+            if executor is None:
+                pool.shutdown()
+        
+        result = np.ndarray((size,), dtype=dtype, buffer=output_shm.buf).copy()
+        del model, grid
+        return result.reshape(x.shape)
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+def adaptive_sample(evaluate, x_min: float, x_max: float, tolerance: float = 1e-3,
+                    max_points: int = 1000, initial_points: int = 17) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample a curve adaptively: intervals whose midpoint deviates from the chord by more than
+    `tolerance` (relative to the sampled y-range) are bisected, worst first, until every chord
+    is within tolerance or `max_points` samples have been taken
+    `evaluate` maps an ndarray of x values to an ndarray of y values; each refinement round
+    evaluates all new midpoints in one vectorized call
+    """
+    max_points = max(int(max_points), 2)
+    x = np.linspace(x_min, x_max, min(max(int(initial_points), 2), max_points))
+    y = np.asarray(evaluate(x), dtype=float)
+    
+    while x.shape[0] < max_points:
+        midpoints = (x[:-1] + x[1:]) / 2.0
+        # Stop once intervals can no longer be split in floating point
+        splittable = (midpoints > x[:-1]) & (midpoints < x[1:])
+        if not np.any(splittable):
+            break
+        midpoint_values = np.asarray(evaluate(midpoints), dtype=float)
+        
+        span = float(np.max(y) - np.min(y)) if np.all(np.isfinite(y)) else 0.0
+        threshold = tolerance * (span if span > 0 else 1.0)
+        errors = np.abs(midpoint_values - (y[:-1] + y[1:]) / 2.0)
+        errors[~splittable] = 0.0
+        refine = np.flatnonzero(errors > threshold)
+        if refine.size == 0:
+            break
+        
+        budget = max_points - x.shape[0]
+        if refine.size > budget:
+            refine = np.sort(refine[np.argsort(errors[refine])[::-1][:budget]])
+        
+        x = np.insert(x, refine + 1, midpoints[refine])
+        y = np.insert(y, refine + 1, midpoint_values[refine])
+    
+    return x, y
+
+def solve_vandermonde(x_values, y_values) -> np.ndarray:
+    """
+    Solve the Vandermonde interpolation system for monomial coefficients (increasing powers)
+    Bjorck-Pereyra algorithm: divided differences followed by Newton-to-monomial conversion,
+    O(n^2) operations with O(n) extra memory
+    """
+    x = np.asarray(x_values, dtype=float)
+    coefficients = np.array(y_values, dtype=float)
+    n = len(x) - 1
+    
+    # Newton divided differences, computed in place
+    for k in range(n):
+        coefficients[k + 1:] = (coefficients[k + 1:] - coefficients[k:-1]) / (x[k + 1:] - x[:n - k])
+    
+    # Expand the Newton form into the monomial basis
+    for k in range(n - 1, -1, -1):
+        coefficients[k:n] -= coefficients[k + 1:] * x[k]
+    
+    return coefficients
+
+def clenshaw_chebyshev(coefficients, t) -> np.ndarray:
+    """
+    Evaluate sum_k c_k T_k(t) with the Clenshaw recurrence, vectorized over t
+    O(n) work per point
+    """
+    c = np.asarray(coefficients, dtype=float)
+    t = np.asarray(t, dtype=float)
+    b1 = np.zeros_like(t)
+    b2 = np.zeros_like(t)
+    two_t = 2.0 * t
+    for k in range(len(c) - 1, 0, -1):
+        b1, b2 = two_t * b1 - b2 + c[k], b1
+    return t * b1 - b2 + c[0]
+
+class ChebyshevInterpolant:
+    """
+    Interpolating polynomial stored in the Chebyshev basis on the data interval [a, b]
+    Stable for high degrees where monomial coefficients are not
+    """
+    
+    def __init__(self, coefficients, domain: Tuple[float, float]):
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.domain = (float(domain[0]), float(domain[1]))
+    
+    @property
+    def degree(self) -> int:
+        return len(self.coefficients) - 1
+    
+    def map_to_reference(self, x_values) -> np.ndarray:
+        """
+        Map x from the data interval to t in [-1, 1]
+        """
+        a, b = self.domain
+        return (2.0 * np.asarray(x_values, dtype=float) - (a + b)) / (b - a)
+    
+    def __call__(self, x_values, dtype=np.float64) -> np.ndarray:
+        values = clenshaw_chebyshev(self.coefficients, self.map_to_reference(x_values))
+        return values.astype(resolve_precision(dtype), copy=False)
+    
+    def antiderivative(self) -> 'ChebyshevInterpolant':
+        """
+        Exact antiderivative as another Chebyshev series on the same domain
+        """
+        a, b = self.domain
+        coefficients = np.polynomial.chebyshev.chebint(self.coefficients, scl=(b - a) / 2.0)
+        return ChebyshevInterpolant(coefficients, self.domain)
+    
+    def to_monomial(self) -> List[float]:
+        """
+        Convert to monomial coefficients in x (increasing powers)
+        Only meaningful for moderate degrees
+        """
+        series = np.polynomial.Chebyshev(self.coefficients, domain=self.domain)
+        return series.convert(kind=np.polynomial.Polynomial).coef.tolist()
+
+class CompiledEvaluator:
+    """
+    Immutable evaluator holding sorted nodes, values and barycentric weights
+    in one contiguous (3, n) float64 array
+    Pickles to the raw array bytes (24 bytes per node) and loads back without
+    re-validating or re-sorting the nodes
+    """
+    
+    __slots__ = ('_data',)
+    
+    def __init__(self, nodes, values, weights):
+        data = np.ascontiguousarray(np.vstack([nodes, values, weights]), dtype=np.float64)
+        data.flags.writeable = False
+        object.__setattr__(self, '_data', data)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledEvaluator is immutable")
+    
+    @property
+    def nodes(self) -> np.ndarray:
+        return self._data[0]
+    
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[1]
+    
+    @property
+    def weights(self) -> np.ndarray:
+        return self._data[2]
+    
+    @property
+    def n(self) -> int:
+        return self._data.shape[1]
+    
+    def __call__(self, x_values, dtype=np.float64) -> np.ndarray:
+        return barycentric_evaluate(self.nodes, self.values, self.weights, x_values, dtype)
+    
+    def to_bytes(self) -> bytes:
+        """
+        Serialize to little-endian float64 bytes
+        """
+        return self._data.astype('<f8', copy=False).tobytes()
+    
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'CompiledEvaluator':
+        """
+        Load an evaluator produced by to_bytes() without any validation or sorting
+        """
+        data = np.frombuffer(payload, dtype='<f8').reshape(3, -1).astype(np.float64, copy=False)
+        evaluator = object.__new__(cls)
+        object.__setattr__(evaluator, '_data', data)
+        return evaluator
+    
+    def __reduce__(self):
+        return (CompiledEvaluator.from_bytes, (self.to_bytes(),))
+
+class DividedDifferenceTable:
+    """
+    Newton divided-difference table that can be extended one node at a time
+    Only the last diagonal of the table is kept, so each extension costs O(n)
+    """
+    
+    def __init__(self):
+        self.nodes: List[float] = []
+        self.coefficients: List[float] = []
+        self._diagonal: List[float] = []
+    
+    @property
+    def n(self) -> int:
+        return len(self.nodes)
+    
+    def add_node(self, x: float, y: float) -> float:
+        """
+        Append a node and return the new Newton coefficient f[x_0, ..., x_k]
+        """
+        x = float(x)
+        diagonal = [float(y)]
+        for i, previous in enumerate(self._diagonal):
+            diagonal.append((diagonal[i] - previous) / (x - self.nodes[-1 - i]))
+        
+        self.nodes.append(x)
+        self._diagonal = diagonal
+        self.coefficients.append(diagonal[-1])
+        return diagonal[-1]
+
+def as_float_array(values) -> np.ndarray:
+    """
+    View array-likes and raw buffers (little-endian float64) as 1-D float64 arrays without copying when possible
+    """
+    if isinstance(values, (bytes, bytearray, memoryview)):
+        return np.frombuffer(values, dtype='<f8').astype(np.float64, copy=False)
+    return np.asarray(values, dtype=np.float64).ravel()
+
 class LagrangeInterpolator:
     """
     Lagrange Interpolation implementation with animation support
+    Nodes are stored once, as a sorted (2, n) float64 array with x and y exposed as row views
     """
     
+    __slots__ = ('_data', 'weights', '_weight_scale', '_chebyshev', '_memo')
+    
     def __init__(self, points: List[Tuple[float, float]]):
         """
-        Initialize with a list of (x, y) points
+        Initialize with a list of (x, y) points or an (n, 2) array
         """
         if len(points) < 2:
             raise ValueError("At least 2 points are required for interpolation")
         
-        # Check for duplicate x-coordinates before sorting
-        x_coords = [p[0] for p in points]
-        if len(set(x_coords)) != len(x_coords):
-            # Find the duplicates
-            seen = set()
-            duplicates = set()
-            for x in x_coords:
-                if x in seen:
-                    duplicates.add(x)
-                seen.add(x)
-            raise ValueError(f"Duplicate x-coordinates found: {sorted(duplicates)}. Each x-coordinate must be unique for interpolation.")
-        
-        self.points = sorted(points, key=lambda p: p[0])  # Sort by x-coordinate
-        self.x_values = [p[0] for p in self.points]
-        self.y_values = [p[1] for p in self.points]
-        self.n = len(self.points)
+        data = np.asarray(points, dtype=np.float64)
+        if data.ndim != 2 or data.shape[1] != 2:
+            raise ValueError("Points must be given as (x, y) pairs")
+        self._set_nodes(data[:, 0], data[:, 1])
+    
+    @classmethod
+    def from_arrays(cls, x_values, y_values) -> 'LagrangeInterpolator':
+        """
+        Build directly from x and y arrays or float64 buffers, without going through tuples
+        """
+        x = as_float_array(x_values)
+        y = as_float_array(y_values)
+        if x.shape != y.shape:
+            raise ValueError("x and y arrays must have the same length")
+        if x.shape[0] < 2:
+            raise ValueError("At least 2 points are required for interpolation")
+        
+        interpolator = cls.__new__(cls)
+        interpolator._set_nodes(x, y)
+        return interpolator
+
+    @classmethod
+    def from_compiled(cls, evaluator: 'CompiledEvaluator', coefficients=None) -> 'LagrangeInterpolator':
+        """
+        Rebuild an interpolator from a CompiledEvaluator in O(n), reusing its sorted nodes and weights
+        Optional precomputed monomial coefficients are memoized instead of being re-solved
+        """
+        interpolator = cls.__new__(cls)
+        interpolator._data = np.array(evaluator._data[:2], dtype=np.float64)
+        nodes = interpolator._data[0]
+        interpolator._weight_scale = cls._difference_scale(nodes)
+
+        # Weights updated incrementally carry the scale factor of the interpolator they came from;
+        # renormalize against the first weight recomputed at this scale so later add_point() calls agree
+        diff = (nodes[0] - nodes) / interpolator._weight_scale
+        diff[0] = 1.0
+        first_weight = 1.0 / np.prod(diff)
+        interpolator.weights = evaluator.weights * (first_weight / evaluator.weights[0])
+        interpolator._chebyshev = None
+        interpolator._memo = {}
+        if coefficients is not None:
+            interpolator._memo['coefficients'] = [float(c) for c in coefficients]
+        return interpolator
+
+    def _set_nodes(self, x: np.ndarray, y: np.ndarray):
+        """
+        Sort the nodes, reject duplicate x-coordinates and precompute the barycentric weights
+        """
+        order = np.argsort(x, kind='stable')
+        data = np.empty((2, x.shape[0]))
+        data[0] = x[order]
+        data[1] = y[order]
+        
+        duplicates = data[0, 1:][np.diff(data[0]) == 0]
+        if duplicates.size:
+            raise ValueError(f"Duplicate x-coordinates found: {sorted(set(duplicates.tolist()))}. Each x-coordinate must be unique for interpolation.")
+        
+        self._data = data
+        self._weight_scale = self._difference_scale(data[0])
+        self.weights = self._compute_barycentric_weights(data[0], self._weight_scale)
+        self._chebyshev = None
+        self._memo = {}
+    
+    @property
+    def x_values(self) -> np.ndarray:
+        return self._data[0]
+    
+    @property
+    def y_values(self) -> np.ndarray:
+        return self._data[1]
+    
+    @property
+    def n(self) -> int:
+        return self._data.shape[1]
+    
+    @property
+    def points(self) -> List[Tuple[float, float]]:
+        """
+        Sorted (x, y) tuples, built on demand
+        """
+        return list(zip(*self._data.tolist()))
+    
+    @staticmethod
+    def _difference_scale(nodes: np.ndarray) -> float:
+        """
+        Scale applied to node differences when building weights (a quarter of the interval)
+        """
+        scale = (nodes[-1] - nodes[0]) / 4.0 if len(nodes) > 1 else 1.0
+        return float(scale) if scale != 0 else 1.0
+    
+    @staticmethod
+    def _compute_barycentric_weights(nodes: np.ndarray, scale: float = 1.0) -> np.ndarray:
+        """
+        Compute the barycentric weights w_j = 1 / prod_{i != j} (x_j - x_i)
+        Differences are divided by `scale` to avoid overflow for large n;
+        the barycentric formula is invariant under a common scaling of the weights.
+        """
+        n = len(nodes)
+        weights = np.empty(n)
+        for j in range(n):
+            diff = (nodes[j] - nodes) / scale
+            diff[j] = 1.0
+            weights[j] = 1.0 / np.prod(diff)
+        return weights
+    
+    def add_point(self, x: float, y: float) -> int:
+        """
+        Insert a new node and update the barycentric weights in O(n)
+        Edits this interpolator in place, so instances other threads may be evaluating must be copied first
+        Returns the index of the new node in the sorted node list
+        """
+        x, y = float(x), float(y)
+        index = int(np.searchsorted(self.x_values, x))
+        if index < self.n and self.x_values[index] == x:
+            raise ValueError(f"Duplicate x-coordinates found: [{x}]. Each x-coordinate must be unique for interpolation.")
+        
+        diff = (self.x_values - x) / self._weight_scale
+        new_weight = 1.0 / np.prod(-diff)
+        weights = self.weights / diff
+        
+        self._data = np.insert(self._data, index, (x, y), axis=1)
+        self.weights = np.insert(weights, index, new_weight)
+        self._chebyshev = None
+        self._memo = {}
+        return index
+    
+    def remove_point(self, x: float) -> Tuple[float, float]:
+        """
+        Remove the node with x-coordinate `x` and update the barycentric weights in O(n)
+        Edits this interpolator in place (see add_point)
+        Returns the removed (x, y) point
+        """
+        x = float(x)
+        index = int(np.searchsorted(self.x_values, x))
+        if index == self.n or self.x_values[index] != x:
+            raise ValueError(f"No interpolation point with x-coordinate {x}")
+        if self.n <= 2:
+            raise ValueError("At least 2 points are required for interpolation")
+        
+        removed = (x, float(self.y_values[index]))
+        self._data = np.delete(self._data, index, axis=1)
+        self.weights = np.delete(self.weights, index) * ((self.x_values - x) / self._weight_scale)
+        self._chebyshev = None
+        self._memo = {}
+        return removed
     
     def lagrange_basis(self, x: float, j: int) -> float:
         """
@@ -59,147 +576,334 @@ class LagrangeInterpolator:
     
     def interpolate(self, x: float) -> float:
         """
-        Evaluate the Lagrange polynomial at point x
+        Evaluate the Lagrange polynomial at point x using the barycentric (second) form
+        Costs O(n) per evaluation once the weights are known
         """
-        result = 0.0
-        for j in range(self.n):
-            result += self.y_values[j] * self.lagrange_basis(x, j)
-        return result
+        diff = x - self.x_values
+        exact = np.flatnonzero(diff == 0)
+        if exact.size:
+            return float(self.y_values[exact[0]])
+        terms = self.weights / diff
+        return float(np.dot(terms, self.y_values) / np.sum(terms))
+    
+    def evaluate_array(self, x_values, dtype=np.float64) -> np.ndarray:
+        """
+        Vectorized barycentric evaluation of the polynomial at an array of x values
+        `dtype` selects float32 or float64 output
+        """
+        return barycentric_evaluate(self.x_values, self.y_values, self.weights, x_values, dtype)
+    
+    def evaluate_parallel(self, x_values, workers: int = None, dtype=np.float64,
+                          executor: ProcessPoolExecutor = None) -> np.ndarray:
+        """
+        Evaluate a very large grid across a process pool using shared memory
+        Falls back to evaluate_array() for grids below PARALLEL_MIN_POINTS
+        """
+        return parallel_evaluate(self.x_values, self.y_values, self.weights, x_values, workers, dtype, executor)
+    
+    def derivative_node_values(self, order: int = 1) -> np.ndarray:
+        """
+        Values of the order-th derivative at the nodes, by repeated application of the
+        barycentric differentiation matrix D_ij = (w_j / w_i) / (x_i - x_j), D_ii = -sum_j D_ij
+        D is applied in row blocks and never stored, so memory stays O(n) per block
+        """
+        values = self.y_values.copy()
+        if order >= self.n:
+            return np.zeros(self.n)
+        
+        nodes, weights = self.x_values, self.weights
+        block = max(1, EVAL_BLOCK_ELEMENTS // self.n)
+        for _ in range(order):
+            derivative = np.empty(self.n)
+            for start in range(0, self.n, block):
+                rows = np.arange(start, min(start + block, self.n))
+                diff = nodes[rows, None] - nodes[None, :]
+                diff[np.arange(rows.size), rows] = np.inf
+                derivative[rows] = ((weights / diff) * (values[None, :] - values[rows, None])).sum(axis=1) / weights[rows]
+            values = derivative
+        return values
+    
+    def derivative(self, x_values, order: int = 1, dtype=np.float64) -> np.ndarray:
+        """
+        Vectorized evaluation of the order-th derivative of the polynomial
+        The derivative has degree < n, so it is interpolated exactly by the barycentric
+        form on the same nodes and weights
+        """
+        if order < 0:
+            raise ValueError("The derivative order must be non-negative")
+        values = self.derivative_node_values(order) if order else self.y_values
+        return barycentric_evaluate(self.x_values, values, self.weights, x_values, dtype)
+    
+    def integrate(self, lower, upper):
+        """
+        Exact definite integral(s) of the polynomial from `lower` to `upper`
+        Integrates the Chebyshev representation term by term; vectorized over array bounds
+        """
+        antiderivative = self.to_chebyshev().antiderivative()
+        result = antiderivative(upper) - antiderivative(lower)
+        return float(result) if np.ndim(result) == 0 else result
+    
+    def compile(self) -> 'CompiledEvaluator':
+        """
+        Freeze the current nodes, values and weights into an immutable, picklable evaluator
+        """
+        return CompiledEvaluator(self.x_values, self.y_values, self.weights)
     
     def interpolate_range(self, x_min: float = None, x_max: float = None, num_points: int = 100) -> Tuple[List[float], List[float]]:
         """
         Interpolate over a range of x values
         """
         if x_min is None:
-            x_min = min(self.x_values) - 1
+            x_min = self.x_values[0] - 1
         if x_max is None:
-            x_max = max(self.x_values) + 1
+            x_max = self.x_values[-1] + 1
         
         x_range = np.linspace(x_min, x_max, num_points)
-        y_range = [self.interpolate(x) for x in x_range]
+        y_range = self.evaluate_array(x_range)
         
-        return x_range.tolist(), y_range
+        return x_range.tolist(), y_range.tolist()
+    
+    def interpolate_adaptive(self, x_min: float = None, x_max: float = None, tolerance: float = 1e-3,
+                             max_points: int = 1000) -> Tuple[List[float], List[float]]:
+        """
+        Interpolate over a range with a grid refined where the curve bends (see adaptive_sample)
+        """
+        if x_min is None:
+            x_min = self.x_values[0] - 1
+        if x_max is None:
+            x_max = self.x_values[-1] + 1
+        
+        x_range, y_range = adaptive_sample(self.evaluate_array, x_min, x_max, tolerance, max_points)
+        return x_range.tolist(), y_range.tolist()
     
     def get_polynomial_coefficients(self) -> List[float]:
         """
         Get the coefficients of the interpolating polynomial
         Returns coefficients for polynomial a_n*x^n + a_(n-1)*x^(n-1) + ... + a_1*x + a_0
+        (listed from a_0 up to a_n), solved in O(n^2) with the Bjorck-Pereyra algorithm
+        Raises ValueError when the monomial basis is too ill-conditioned for the nodes
         """
+        if 'coefficients' in self._memo:
+            return list(self._memo['coefficients'])
+        
+        condition = self.estimate_condition_number()
+        if condition > MAX_MONOMIAL_CONDITION:
+            raise ValueError(
+                f"The monomial basis is too ill-conditioned for these points (estimated condition number "
+                f"{condition:.3g}); request basis='chebyshev' for a stable representation."
+            )
+        
         try:
-            # Check for duplicate x-coordinates
-            x_set = set(self.x_values)
-            if len(x_set) != len(self.x_values):
-                raise ValueError("Duplicate x-coordinates found. Each x-coordinate must be unique for interpolation.")
+            coefficients = solve_vandermonde(self.x_values, self.y_values)
             
-            # Create Vandermonde matrix
-            V = np.vander(self.x_values, increasing=True)
-            
-            # Check if matrix is singular
-            det = np.linalg.det(V)
-            if abs(det) < 1e-12:
+            # Overflow in the solver means the monomial basis cannot represent this set
+            if not np.all(np.isfinite(coefficients)):
                 raise ValueError("Singular matrix detected. The points may be too close together or collinear.")
             
-            # Use least squares solver for better numerical stability
-            coefficients, residuals, rank, s = np.linalg.lstsq(V, self.y_values, rcond=None)
-            
-            # Check if the solution is valid
-            if rank < V.shape[1]:
-                raise ValueError("The matrix is rank deficient. Cannot find unique polynomial coefficients.")
-            
-            return coefficients.tolist()
+            self._memo['coefficients'] = coefficients.tolist()
+            return list(self._memo['coefficients'])
             
-        except np.linalg.LinAlgError as e:
-            raise ValueError(f"Linear algebra error during polynomial coefficient calculation: {str(e)}")
         except Exception as e:
             raise ValueError(f"Error calculating polynomial coefficients: {str(e)}")
     
+    def to_chebyshev(self) -> ChebyshevInterpolant:
+        """
+        Represent the interpolant in the Chebyshev basis on [min(x), max(x)]
+        The polynomial is sampled at n Chebyshev points of the first kind with the barycentric
+        form and transformed with an FFT-based DCT-II, O(n^2) overall
+        """
+        if self._chebyshev is None:
+            n = self.n
+            a, b = self.x_values[0], self.x_values[-1]
+            theta = np.pi * (np.arange(n) + 0.5) / n
+            samples = self.evaluate_array((a + b) / 2.0 + (b - a) / 2.0 * np.cos(theta))
+            
+            spectrum = np.fft.fft(np.concatenate([samples, samples[::-1]]))[:n]
+            coefficients = (spectrum * np.exp(-0.5j * np.pi * np.arange(n) / n)).real / n
+            coefficients[0] /= 2.0
+            self._chebyshev = ChebyshevInterpolant(coefficients, (a, b))
+        return self._chebyshev
+    
+    def estimate_condition_number(self) -> float:
+        """
+        Cheap O(n) estimate of the infinity-norm condition number of the Vandermonde matrix
+        Uses Gautschi's bound on ||V^-1|| expressed through the barycentric weights;
+        returns inf when the estimate overflows float64
+        """
+        nodes = self.x_values
+        log_abs_x = np.log1p(np.abs(nodes))
+        # log prod_{i != j} |x_j - x_i| recovered from the scaled weights
+        log_denominators = (self.n - 1) * math.log(abs(self._weight_scale)) - np.log(np.abs(self.weights))
+        log_inverse_norm = np.max(log_abs_x.sum() - log_abs_x - log_denominators)
+        
+        r = float(np.max(np.abs(nodes)))
+        if r == 0:
+            log_norm = 0.0
+        else:
+            log_norm = float(np.logaddexp.reduce(np.arange(self.n) * math.log(r)))
+        
+        log_condition = log_norm + log_inverse_norm
+        return math.exp(log_condition) if log_condition < 709 else float('inf')
+    
+    def _animation_samples(self, num_steps: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sample the partial interpolants shown by the animation on one shared 100-point grid
+        Frames are built from one Newton divided-difference table extended one node per step,
+        so each frame adds a single Newton term to the previous frame's samples
+        Returns the grid and a (frames, 100) array; memoized per num_steps
+        """
+        memo_key = ('animation_samples', num_steps)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+        
+        x_min, x_max = self.x_values[0] - 1, self.x_values[-1] + 1
+        x_plot = np.linspace(x_min, x_max, 100)
+        
+        steps = min(num_steps, self.n)
+        frames = np.empty((steps, x_plot.shape[0]))
+        table = DividedDifferenceTable()
+        table.add_node(self.x_values[0], self.y_values[0])
+        y_plot = np.full_like(x_plot, table.coefficients[0])
+        newton_basis = np.ones_like(x_plot)
+        
+        for step in range(1, steps + 1):
+            # Use only the first 'step + 1' points
+            if min(step + 1, self.n) > table.n:
+                newton_basis *= x_plot - table.nodes[-1]
+                y_plot += table.add_node(self.x_values[step], self.y_values[step]) * newton_basis
+            frames[step - 1] = y_plot
+        
+        self._memo[memo_key] = (x_plot, frames)
+        return x_plot, frames
+    
     def get_animation_data(self, num_steps: int = 50) -> List[dict]:
         """
         Generate data for animating the interpolation process
+        Each frame repeats the x grid and the points used; see get_compact_animation_data()
+        The frames are memoized per num_steps and shared between callers
         """
-        animation_steps = []
-        x_min, x_max = min(self.x_values) - 1, max(self.x_values) + 1
-        x_plot = np.linspace(x_min, x_max, 100)
+        memo_key = ('animation', num_steps)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+        
+        x_plot, frames = self._animation_samples(num_steps)
+        x_list = x_plot.tolist()
+        points = self.points
         
-        for step in range(1, min(num_steps, self.n) + 1):
-            # Use only the first 'step' points
-            partial_points = self.points[:step + 1]
-            if len(partial_points) >= 2:
-                partial_interpolator = LagrangeInterpolator(partial_points)
-                x_range, y_range = partial_interpolator.interpolate_range(x_min, x_max, 100)
-                
-                animation_steps.append({
-                    'step': step,
-                    'points_used': partial_points,
-                    'x_values': x_range,
-                    'y_values': y_range,
-                    'polynomial_degree': len(partial_points) - 1
-                })
+        animation_steps = []
+        for step, y_plot in enumerate(frames, start=1):
+            partial_points = points[:step + 1]
+            animation_steps.append({
+                'step': step,
+                'points_used': partial_points,
+                'x_values': x_list,
+                'y_values': y_plot.tolist(),
+                'polynomial_degree': len(partial_points) - 1
+            })
         
+        self._memo[memo_key] = animation_steps
         return animation_steps
     
+    def get_compact_animation_data(self, num_steps: int = 50, quantize: bool = False) -> dict:
+        """
+        Animation data without repetition: one shared x grid, the sorted nodes once,
+        per frame the number of leading nodes used, and a (frames, 100) array of samples
+        With `quantize`, samples are sent as uint16 per frame: y = offset + q * scale
+        """
+        x_plot, frames = self._animation_samples(num_steps)
+        nodes_used = np.minimum(np.arange(2, frames.shape[0] + 2), self.n)
+        animation = {
+            'format': 'compact',
+            'x_values': x_plot,
+            'nodes': self._data.T,
+            'nodes_used': nodes_used,
+        }
+        
+        if not quantize:
+            animation['y_values'] = frames
+            return animation
+        
+        offset = frames.min(axis=1)
+        scale = (frames.max(axis=1) - offset) / 65535.0
+        scale[scale == 0] = 1.0
+        animation['format'] = 'quantized'
+        animation['y_values'] = np.rint((frames - offset[:, None]) / scale[:, None]).astype(np.uint16)
+        animation['y_offset'] = offset
+        animation['y_scale'] = scale
+        return animation
+    
+    def memory_footprint(self) -> int:
+        """
+        Approximate bytes held by this interpolator, including memoized derived data
+        Python floats in cached lists are counted at 32 bytes (object plus list slot)
+        """
+        size = self._data.nbytes + self.weights.nbytes
+        if self._chebyshev is not None:
+            size += self._chebyshev.coefficients.nbytes
+        for key, value in self._memo.items():
+            if key == 'coefficients':
+                size += 32 * len(value)
+            elif key[0] == 'animation_samples':
+                size += sum(array.nbytes for array in value)
+            else:
+                # Animation frames: shared x grid, per-frame y samples and point tuples
+                size += sum(32 * len(frame['y_values']) + 120 * len(frame['points_used']) + 400 for frame in value)
+                size += 32 * len(value[0]['x_values']) if value else 0
+        return size
+    
     def evaluate_at_points(self, x_values: List[float]) -> List[float]:
         """
         Evaluate the polynomial at specific x values
         """
-        return [self.interpolate(x) for x in x_values]
+        return self.evaluate_array(x_values).tolist()
     
-    def get_lagrange_terms_details(self) -> dict:
+    def get_lagrange_terms_details(self, start: int = 0, count: int = None) -> dict:
         """
         Get detailed information about each Lagrange term including symbolic and numerical forms
         Returns a dictionary with evaluation_point, terms list, and polynomial_value
+        Only terms start .. start+count-1 are built (all terms when count is None); the numeric
+        parts of the window are computed in one vectorized pass and the symbolic strings are
+        rendered only for that window
         """
-        n = len(self.points)
+        n = self.n
+        start = min(max(int(start), 0), n)
+        stop = n if count is None else min(start + max(int(count), 0), n)
         
         # Choose evaluation point - use midpoint or 0 if it's in range
-        x_min, x_max = min(self.x_values), max(self.x_values)
+        x_min, x_max = float(self.x_values[0]), float(self.x_values[-1])
         test_x = (x_min + x_max) / 2  # Midpoint for evaluation
         
         # Use x=0 if it's within a reasonable range
         if x_min <= 0 <= x_max:
             test_x = 0.0
         
-        terms_details = []
+        # Numerators prod_{i != j} (test_x - x_i) for every j from prefix and suffix products
+        diff = test_x - self.x_values
+        prefix = np.concatenate(([1.0], np.cumprod(diff[:-1])))
+        suffix = np.concatenate((np.cumprod(diff[:0:-1])[::-1], [1.0]))
+        numerators = (prefix * suffix)[start:stop]
         
-        for j in range(n):
-            # Get the point for this term
-            x_j, y_j = self.points[j]
-            
-            # Build factors for symbolic representation
-            factors = []
-            denominator_calculation = []
-            denominator_value = 1.0
-            
-            for i in range(n):
-                if i != j:
-                    x_i = self.x_values[i]
-                    # Factor: (x - x_i)
-                    factors.append(f"(x - {x_i})")
-                    # Denominator calculation: (x_j - x_i)
-                    denominator_calculation.append(f"({x_j} - {x_i})")
-                    # Calculate denominator value
-                    denominator_value *= (x_j - x_i)
-            
-            # Calculate numerator at evaluation point
-            numerator_at_eval = 1.0
-            for i in range(n):
-                if i != j:
-                    x_i = self.x_values[i]
-                    numerator_at_eval *= (test_x - x_i)
-            
-            # Calculate the Lagrange basis function value at test_x
-            lagrange_value = self.lagrange_basis(test_x, j)
-            
-            # Build symbolic representation
-            symbolic = f"L_{j}(x) = " + " * ".join(factors) + f" / {denominator_value}"
+        # Denominators prod_{i != j} (x_j - x_i) for the requested window only
+        window = self.x_values[start:stop, None] - self.x_values[None, :]
+        window[np.arange(stop - start), np.arange(start, stop)] = 1.0
+        denominators = np.prod(window, axis=1)
+        final_values = numerators / denominators
+        
+        x_list = self.x_values.tolist()
+        terms_details = []
+        for offset, j in enumerate(range(start, stop)):
+            x_j = x_list[j]
+            others = x_list[:j] + x_list[j + 1:]
+            factors = [f"(x - {x_i})" for x_i in others]
+            denominator_value = float(denominators[offset])
             
             terms_details.append({
-                'symbolic': symbolic,
+                'symbolic': f"L_{j}(x) = " + " * ".join(factors) + f" / {denominator_value}",
                 'factors': factors,
-                'denominator_calculation': denominator_calculation,
+                'denominator_calculation': [f"({x_j} - {x_i})" for x_i in others],
                 'denominator_value': denominator_value,
-                'numerator_at_eval': numerator_at_eval,
-                'final_value': lagrange_value
+                'numerator_at_eval': float(numerators[offset]),
+                'final_value': float(final_values[offset])
             })
         
         # Calculate polynomial value at evaluation point
@@ -208,5 +912,91 @@ class LagrangeInterpolator:
         return {
             'evaluation_point': test_x,
             'terms': terms_details,
-            'polynomial_value': polynomial_value
+            'polynomial_value': polynomial_value,
+            'total_terms': n,
+            'terms_start': start
         }
+
+
+class PiecewiseLagrangeInterpolator:
+    """
+    Local (windowed) Lagrange interpolation for very large point sets
+    Each query is interpolated with the `degree + 1` nodes around it, located by binary search,
+    so evaluating m points costs O(m * (log n + degree^2)) instead of a global O(n^2) polynomial
+    """
+    
+    def __init__(self, points, degree: int = 3):
+        data = np.asarray(points, dtype=float)
+        if data.ndim != 2 or data.shape[0] < 2 or data.shape[1] != 2:
+            raise ValueError("At least 2 points are required for interpolation")
+        if degree < 1:
+            raise ValueError("The local polynomial degree must be at least 1")
+        
+        order = np.argsort(data[:, 0], kind='stable')
+        self.x_values = np.ascontiguousarray(data[order, 0])
+        self.y_values = np.ascontiguousarray(data[order, 1])
+        
+        duplicates = self.x_values[1:][np.diff(self.x_values) == 0]
+        if duplicates.size:
+            raise ValueError(f"Duplicate x-coordinates found: {sorted(set(duplicates.tolist()))}. Each x-coordinate must be unique for interpolation.")
+        
+        self.n = len(self.x_values)
+        self.degree = min(int(degree), self.n - 1)
+    
+    def window_starts(self, x: np.ndarray) -> np.ndarray:
+        """
+        Index of the first node of the window used for each query point
+        """
+        k = self.degree + 1
+        index = np.searchsorted(self.x_values, x)
+        return np.clip(index - (k + 1) // 2, 0, self.n - k)
+    
+    def evaluate_array(self, x_values, dtype=np.float64) -> np.ndarray:
+        """
+        Evaluate the piecewise interpolant at an array of x values
+        `dtype` selects float32 or float64 output
+        """
+        x = np.asarray(x_values, dtype=float)
+        flat = x.ravel()
+        result = np.empty(flat.shape[0], dtype=resolve_precision(dtype))
+        k = self.degree + 1
+        offsets = np.arange(k)
+        block = max(1, EVAL_BLOCK_ELEMENTS // k)
+        
+        for start in range(0, flat.shape[0], block):
+            chunk = flat[start:start + block]
+            window = self.window_starts(chunk)[:, None] + offsets
+            nodes = self.x_values[window]
+            values = self.y_values[window]
+            
+            block_values = np.zeros(chunk.shape[0])
+            for j in range(k):
+                basis = np.ones(chunk.shape[0])
+                for i in range(k):
+                    if i != j:
+                        basis *= (chunk - nodes[:, i]) / (nodes[:, j] - nodes[:, i])
+                block_values += values[:, j] * basis
+            result[start:start + block] = block_values
+        
+        return result.reshape(x.shape)
+    
+    def interpolate(self, x: float) -> float:
+        return float(self.evaluate_array(np.array([x]))[0])
+    
+    def interpolate_range(self, x_min: float = None, x_max: float = None, num_points: int = 100) -> Tuple[List[float], List[float]]:
+        """
+        Interpolate over a range of x values
+        """
+        if x_min is None:
+            x_min = self.x_values[0] - 1
+        if x_max is None:
+            x_max = self.x_values[-1] + 1
+        
+        x_range = np.linspace(x_min, x_max, num_points)
+        return x_range.tolist(), self.evaluate_array(x_range).tolist()
+    
+    def evaluate_at_points(self, x_values: List[float]) -> List[float]:
+        """
+        Evaluate the piecewise interpolant at specific x values
+        """
+        return self.evaluate_array(x_values).tolist()
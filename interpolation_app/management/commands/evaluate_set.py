@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand, CommandError
+import numpy as np
+import time
+from interpolation_app.lagrange import LagrangeInterpolator, PRECISIONS
+from interpolation_app.models import InterpolationSet
+
+
+class Command(BaseCommand):
+    help = 'Evaluate an interpolation set on a large grid, optionally across a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--set-id',
+            type=int,
+            required=True,
+            help='ID of the interpolation set to evaluate',
+        )
+        parser.add_argument(
+            '--num-points',
+            type=int,
+            default=1000000,
+            help='Number of grid points (default: 1000000)',
+        )
+        parser.add_argument(
+            '--x-min',
+            type=float,
+            help='Start of the grid (default: smallest x - 1)',
+        )
+        parser.add_argument(
+            '--x-max',
+            type=float,
+            help='End of the grid (default: largest x + 1)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Number of worker processes (default: CPU count, 1 disables the pool)',
+        )
+        parser.add_argument(
+            '--precision',
+            choices=sorted(PRECISIONS),
+            default='float64',
+            help='Precision of the stored results',
+        )
+        parser.add_argument(
+            '--output',
+            help='Save the evaluated values to this .npy file',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            interpolation_set = InterpolationSet.objects.get(id=options['set_id'])
+        except InterpolationSet.DoesNotExist:
+            raise CommandError(f"Interpolation set with ID {options['set_id']} not found")
+
+        evaluator = interpolation_set.get_compiled_evaluator()
+        if evaluator is not None:
+            interpolator = LagrangeInterpolator.from_compiled(evaluator)
+        else:
+            points = interpolation_set.get_points_list()
+            if len(points) < 2:
+                raise CommandError('At least 2 points are required for interpolation')
+
+            try:
+                interpolator = LagrangeInterpolator(points)
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        x_min = options['x_min'] if options['x_min'] is not None else interpolator.x_values[0] - 1
+        x_max = options['x_max'] if options['x_max'] is not None else interpolator.x_values[-1] + 1
+        grid = np.linspace(x_min, x_max, options['num_points'])
+
+        self.stdout.write(
+            f"Evaluating '{interpolation_set.name}' ({interpolator.n} points) "
+            f"on {options['num_points']} grid points..."
+        )
+        started = time.perf_counter()
+        y_values = interpolator.evaluate_parallel(grid, workers=options['workers'], dtype=options['precision'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ Evaluated {y_values.size} points in {elapsed:.2f}s')
+        )
+
+        if options['output']:
+            np.save(options['output'], y_values)
+            self.stdout.write(f"Saved results to {options['output']}")
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.16 on 2026-10-18 16:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interpolation_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interpolationset',
+            name='compiled_coefficients',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='interpolationset',
+            name='compiled_data',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='interpolationset',
+            name='compiled_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
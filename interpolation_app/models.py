@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models import F
 import json
+import numpy as np
+from .lagrange import CompiledEvaluator, LagrangeInterpolator
 
 class InterpolationPoint(models.Model):
     x = models.FloatField()
@@ -18,12 +21,71 @@ class InterpolationSet(models.Model):
     points = models.ManyToManyField(InterpolationPoint, related_name='sets')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Sorted nodes, values and barycentric weights (CompiledEvaluator bytes), refreshed whenever
+    # the points change; empty for sets that cannot be interpolated, NULL until (re)compiled.
+    # The monomial coefficients are stored once first computed for a version
+    compiled_data = models.BinaryField(null=True, blank=True, editable=False)
+    compiled_coefficients = models.BinaryField(null=True, blank=True, editable=False)
+    compiled_version = models.PositiveIntegerField(default=0, editable=False)
     
     def __str__(self):
         return self.name
     
     def get_points_list(self):
         return [(point.x, point.y) for point in self.points.all().order_by('x')]
+    
+    def get_compiled_evaluator(self):
+        """Load the stored evaluator, or None if the set is not compiled or cannot be interpolated"""
+        if not self.compiled_data:
+            return None
+        return CompiledEvaluator.from_bytes(bytes(self.compiled_data))
+    
+    def get_compiled_coefficients(self):
+        if not self.compiled_coefficients:
+            return None
+        return np.frombuffer(bytes(self.compiled_coefficients), dtype='<f8')
+    
+    def store_compiled(self, interpolator=None):
+        """
+        Persist the nodes and weights of `interpolator` (rebuilt from the stored points when omitted)
+        and bump compiled_version; sets that cannot be interpolated store empty data
+        Nothing is written when the stored data is already up to date
+        Returns the interpolator that was stored, or None
+        """
+        if interpolator is None:
+            points = self.get_points_list()
+            try:
+                interpolator = LagrangeInterpolator(points) if len(points) >= 2 else None
+            except ValueError:
+                interpolator = None
+        
+        compiled_data = interpolator.compile().to_bytes() if interpolator is not None else b''
+        if self.compiled_data is not None and bytes(self.compiled_data) == compiled_data:
+            return interpolator
+        
+        self.compiled_data = compiled_data
+        self.compiled_coefficients = None
+        InterpolationSet.objects.filter(pk=self.pk).update(
+            compiled_data=self.compiled_data,
+            compiled_coefficients=None,
+            compiled_version=F('compiled_version') + 1
+        )
+        self.refresh_from_db(fields=['compiled_version'])
+        return interpolator
+    
+    def store_coefficients(self, coefficients):
+        """Persist monomial coefficients, unless the points changed since this instance was loaded"""
+        self.compiled_coefficients = np.asarray(coefficients, dtype='<f8').tobytes()
+        InterpolationSet.objects.filter(pk=self.pk, compiled_version=self.compiled_version).update(
+            compiled_coefficients=self.compiled_coefficients
+        )
+    
+    async def astore_coefficients(self, coefficients):
+        """Async version of store_coefficients()"""
+        self.compiled_coefficients = np.asarray(coefficients, dtype='<f8').tobytes()
+        await InterpolationSet.objects.filter(pk=self.pk, compiled_version=self.compiled_version).aupdate(
+            compiled_coefficients=self.compiled_coefficients
+        )
 
 class LagrangeResult(models.Model):
     interpolation_set = models.ForeignKey(InterpolationSet, on_delete=models.CASCADE)
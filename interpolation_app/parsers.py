@@ -0,0 +1,92 @@
+"""
+Binary request parsers for the interpolation API
+Arrays are read with np.frombuffer / np.load and passed to the serializer as ndarrays
+"""
+import io
+import json
+
+import numpy as np
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .renderers import NPZ_META_KEY, msgpack
+
+# Array element kinds accepted from clients (bool, signed/unsigned int, float)
+ARRAY_KINDS = 'biuf'
+
+
+def unflatten_arrays(arrays: dict, data: dict) -> dict:
+    """Place {'a/b': ndarray} members back into the nested `data` dict"""
+    for path, value in arrays.items():
+        *parents, key = path.split('/')
+        target = data
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = value
+    return data
+
+
+def decode_msgpack_array(value: dict):
+    """msgpack `object_hook`: turn {'dtype', 'shape', 'data'} maps back into ndarrays"""
+    if set(value) != {'dtype', 'shape', 'data'}:
+        return value
+    try:
+        dtype = np.dtype(value['dtype'])
+        if dtype.kind not in ARRAY_KINDS:
+            raise ValueError(f"unsupported dtype '{value['dtype']}'")
+        return np.frombuffer(value['data'], dtype=dtype).reshape(value['shape'])
+    except (TypeError, ValueError) as e:
+        raise ParseError(f'Invalid array: {e}')
+
+
+class NpzParser(BaseParser):
+    """
+    NumPy .npz archive as written by NpzRenderer: array members plus optional JSON in '_meta'
+    """
+    media_type = 'application/x-npz'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            with np.load(io.BytesIO(stream.read()), allow_pickle=False) as archive:
+                arrays = {name: archive[name] for name in archive.files}
+        except Exception as e:
+            raise ParseError(f'Invalid .npz payload: {e}')
+
+        meta = arrays.pop(NPZ_META_KEY, None)
+        try:
+            data = json.loads(meta.item()) if meta is not None else {}
+        except (AttributeError, ValueError) as e:
+            raise ParseError(f"Invalid '{NPZ_META_KEY}' member: {e}")
+        if not isinstance(data, dict):
+            raise ParseError(f"The '{NPZ_META_KEY}' member must hold a JSON object")
+
+        for name, array in arrays.items():
+            if array.dtype.kind not in ARRAY_KINDS:
+                raise ParseError(f"Array '{name}' has unsupported dtype '{array.dtype.str}'")
+        return unflatten_arrays(arrays, data)
+
+
+class MsgPackParser(BaseParser):
+    """
+    msgpack with typed arrays ({'dtype', 'shape', 'data'} maps); requires the optional `msgpack` package
+    """
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            data = msgpack.unpackb(stream.read(), object_hook=decode_msgpack_array, raw=False)
+        except ParseError:
+            raise
+        except Exception as e:
+            raise ParseError(f'Invalid msgpack payload: {e}')
+        if not isinstance(data, dict):
+            raise ParseError('The msgpack payload must be a map')
+        return data
+
+
+def binary_parser_classes():
+    """Binary parsers usable in this environment (msgpack only when installed)"""
+    parsers = [NpzParser]
+    if msgpack is not None:
+        parsers.append(MsgPackParser)
+    return parsers
@@ -0,0 +1,110 @@
+"""
+Renderers for the interpolation API
+Binary renderers write NumPy arrays straight from their memory; no Python floats are built.
+The JSON renderer writes float32 arrays with float32's shortest round-trip digits
+"""
+import io
+import json
+
+import numpy as np
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+# Member of an .npz payload holding everything that is not an array, as JSON text
+NPZ_META_KEY = '_meta'
+
+
+def flatten_arrays(data: dict, prefix: str = ''):
+    """
+    Split a (nested) dict into {'a/b': ndarray} members and the remaining JSON-able structure
+    """
+    arrays, rest = {}, {}
+    for key, value in data.items():
+        path = f'{prefix}{key}'
+        if isinstance(value, np.ndarray):
+            arrays[path] = value
+        elif isinstance(value, dict):
+            nested_arrays, nested_rest = flatten_arrays(value, f'{path}/')
+            arrays.update(nested_arrays)
+            rest[key] = nested_rest
+        else:
+            rest[key] = value
+    return arrays, rest
+
+
+def encode_msgpack_value(value):
+    """msgpack `default` hook: arrays as {'dtype', 'shape', 'data'} maps, NumPy scalars as Python values"""
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        return {'dtype': value.dtype.str, 'shape': list(value.shape), 'data': memoryview(value).cast('B')}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(f'Cannot serialize {type(value).__name__} to msgpack')
+
+
+class ArrayJSONEncoder(JSONEncoder):
+    """
+    DRF's JSON encoder, except that float32 arrays are written with the shortest digits that
+    round-trip in float32 (0.1 rather than 0.10000000149011612)
+    """
+
+    def default(self, obj):
+        if isinstance(obj, np.ndarray) and obj.dtype == np.float32:
+            return obj.astype(str).astype(np.float64).tolist()
+        return super().default(obj)
+
+
+class ArrayJSONRenderer(JSONRenderer):
+    """JSON renderer using ArrayJSONEncoder"""
+    encoder_class = ArrayJSONEncoder
+
+
+class NpzRenderer(BaseRenderer):
+    """
+    NumPy .npz archive: every array in the response is a member (nested keys joined with '/'),
+    all other values are stored as JSON text in the '_meta' member
+    """
+    media_type = 'application/x-npz'
+    format = 'npz'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        arrays, rest = flatten_arrays(data)
+        arrays[NPZ_META_KEY] = np.array(json.dumps(rest, cls=JSONEncoder))
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        return buffer.getvalue()
+
+
+class MsgPackRenderer(BaseRenderer):
+    """
+    msgpack with typed arrays: {'dtype': '<f8', 'shape': [...], 'data': <bin>}
+    Requires the optional `msgpack` package
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_msgpack_value, use_bin_type=True)
+
+
+def binary_renderer_classes():
+    """Binary renderers usable in this environment (msgpack only when installed)"""
+    renderers = [NpzRenderer]
+    if msgpack is not None:
+        renderers.append(MsgPackRenderer)
+    return renderers
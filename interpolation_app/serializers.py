@@ -1,4 +1,7 @@
 from rest_framework import serializers
+from rest_framework.fields import empty
+import numpy as np
+from .admission import request_cost, response_values
 from .models import InterpolationPoint, InterpolationSet, LagrangeResult
 
 class InterpolationPointSerializer(serializers.ModelSerializer):
@@ -15,6 +18,9 @@ class InterpolationSetSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'points', 'points_count', 'created_at', 'updated_at']
     
     def get_points_count(self, obj):
+        # Compiled sets store 24 bytes (node, value, weight) per point
+        if obj.compiled_data:
+            return len(obj.compiled_data) // 24
         return obj.points.count()
 
 class LagrangeResultSerializer(serializers.ModelSerializer):
@@ -40,19 +46,150 @@ class LagrangeResultSerializer(serializers.ModelSerializer):
         except:
             return {'points': [], 'results': []}
 
-class InterpolationRequestSerializer(serializers.Serializer):
-    points = serializers.ListField(
+# Response sections of the interpolate endpoints that can be requested (and computed) separately
+INTERPOLATION_SECTIONS = ('coefficients', 'evaluation', 'animation', 'terms')
+
+# Largest uniform grid built in one piece; bigger grids (up to 10**9 points) must be streamed
+MAX_GRID_POINTS = 100000
+
+class SectionsField(serializers.ListField):
+    """
+    Section names as a list or a comma-separated string, also read from the query string
+    (?include=coefficients,evaluation) when absent from the body; normalized to a sorted list
+    """
+    child = serializers.ChoiceField(choices=INTERPOLATION_SECTIONS)
+    
+    def get_value(self, dictionary):
+        value = super().get_value(dictionary)
+        request = self.context.get('request')
+        if value is empty and request is not None:
+            return request.query_params.get(self.field_name, empty)
+        return value
+    
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [name.strip() for name in data.split(',') if name.strip()]
+        return sorted(set(super().to_internal_value(data)))
+
+class FloatArrayField(serializers.ListField):
+    """
+    List of floats (or of fixed-size float rows) that also accepts an ndarray from the binary
+    parsers; arrays are checked by shape and converted in one step instead of element by element
+    """
+    default_error_messages = {
+        'invalid_shape': 'Expected an array of shape {shape}, got {actual}.',
+    }
+    
+    def __init__(self, *args, columns=None, **kwargs):
+        self.columns = columns
+        super().__init__(*args, **kwargs)
+    
+    def to_internal_value(self, data):
+        if not isinstance(data, np.ndarray):
+            return super().to_internal_value(data)
+        
+        ndim = 1 if self.columns is None else 2
+        if data.ndim != ndim or (self.columns is not None and data.shape[1] != self.columns):
+            shape = '(n,)' if self.columns is None else f'(n, {self.columns})'
+            self.fail('invalid_shape', shape=shape, actual=data.shape)
+        if not self.allow_empty and data.shape[0] == 0:
+            self.fail('empty')
+        return data.astype(np.float64, copy=False)
+
+class InterpolationSectionsSerializer(serializers.Serializer):
+    include = SectionsField(required=False, allow_empty=False, default=sorted(INTERPOLATION_SECTIONS))
+    # Window of the 'terms' section
+    terms_offset = serializers.IntegerField(min_value=0, required=False, default=0)
+    terms_limit = serializers.IntegerField(min_value=1, required=False, allow_null=True, default=None)
+
+class InterpolationRequestSerializer(InterpolationSectionsSerializer):
+    points = FloatArrayField(
         child=serializers.ListField(
             child=serializers.FloatField(),
             min_length=2,
             max_length=2
         ),
-        min_length=2
+        min_length=2,
+        columns=2
     )
-    x_values = serializers.ListField(
+    x_values = FloatArrayField(
         child=serializers.FloatField(),
         required=False,
         allow_empty=True
     )
+    basis = serializers.ChoiceField(
+        choices=['monomial', 'chebyshev'],
+        required=False,
+        default='monomial'
+    )
+    precision = serializers.ChoiceField(
+        choices=['float32', 'float64'],
+        required=False,
+        default='float64'
+    )
+    derivative_order = serializers.IntegerField(min_value=1, required=False, allow_null=True, default=None)
+    integral_bounds = serializers.ListField(
+        child=serializers.ListField(
+            child=serializers.FloatField(),
+            min_length=2,
+            max_length=2
+        ),
+        required=False,
+        allow_empty=True
+    )
+    sampling = serializers.ChoiceField(
+        choices=['uniform', 'adaptive'],
+        required=False,
+        default='uniform'
+    )
+    tolerance = serializers.FloatField(min_value=1e-12, required=False, default=1e-3)
+    max_samples = serializers.IntegerField(min_value=2, max_value=MAX_GRID_POINTS, required=False, default=1000)
+    # Uniform default grid; x_min / x_max default to the data range widened by 1 on each side.
+    # Up to MAX_GRID_POINTS points unless streamed
+    num_points = serializers.IntegerField(min_value=2, max_value=10 ** 9, required=False, default=100)
+    x_min = serializers.FloatField(required=False, allow_null=True, default=None)
+    x_max = serializers.FloatField(required=False, allow_null=True, default=None)
+    stream = serializers.ChoiceField(
+        choices=['ndjson', 'binary'],
+        required=False,
+        allow_null=True,
+        default=None
+    )
+    mode = serializers.ChoiceField(
+        choices=['global', 'piecewise'],
+        required=False,
+        default='global'
+    )
+    local_degree = serializers.IntegerField(min_value=1, required=False, default=3)
+    animation_format = serializers.ChoiceField(
+        choices=['frames', 'compact', 'quantized'],
+        required=False,
+        default='frames'
+    )
     name = serializers.CharField(max_length=200, required=False, default="Untitled Set")
     description = serializers.CharField(required=False, allow_blank=True, default="")
+    
+    def validate(self, attrs):
+        if attrs['stream'] and attrs['sampling'] == 'adaptive':
+            raise serializers.ValidationError({'stream': 'Adaptive sampling cannot be streamed; use a uniform grid.'})
+        if not attrs['stream'] and attrs['num_points'] > MAX_GRID_POINTS:
+            raise serializers.ValidationError({
+                'num_points': f'Grids over {MAX_GRID_POINTS} points must be streamed; set stream to "ndjson" or "binary".'
+            })
+        if attrs['stream'] == 'binary':
+            # Binary streams only carry (x, y[, derivative]) rows, so no other section is computed
+            if attrs.get('integral_bounds'):
+                raise serializers.ValidationError({'integral_bounds': 'Binary streams cannot carry integrals; use stream "ndjson".'})
+            attrs['include'] = ['evaluation']
+        # Estimated work and response size, used for admission control once the request is valid
+        self.cost = request_cost(attrs)
+        self.response_values = response_values(attrs)
+        return attrs
+
+class InterpolationBatchSerializer(serializers.Serializer):
+    # Each job is validated separately with InterpolationRequestSerializer so errors stay per job
+    jobs = serializers.ListField(
+        child=serializers.DictField(),
+        min_length=1,
+        max_length=1000
+    )
@@ -0,0 +1,102 @@
+"""
+Keep the compiled data stored on interpolation sets (and their live interpolators) in step
+with point changes: membership edits through the API are applied incrementally in O(n),
+anything else marks the affected sets uncompiled and rebuilds them once the transaction commits
+"""
+import threading
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import live_interpolators, live_key
+from .lagrange import LagrangeInterpolator
+from .models import InterpolationPoint, InterpolationSet
+
+# Serializes refreshes of compiled data and live interpolators (see cache.live_interpolators)
+_live_update_lock = threading.Lock()
+
+
+def refresh_compiled(interpolation_set, added=(), removed=()):
+    """
+    Recompile a set after its points changed and cache the live interpolator for the new data
+    `added` points and `removed` x-coordinates are applied to a copy of the live interpolator when one
+    is held; otherwise (or if they no longer apply) the set is rebuilt from the database
+    The previous live interpolator stays cached under the previous data, which other transactions
+    may still be reading
+    """
+    with _live_update_lock:
+        interpolation_set.refresh_from_db(fields=['compiled_data', 'compiled_version'])
+        interpolator = None
+        # Uncompiled sets have pending edits no live interpolator knows about
+        if (added or removed) and interpolation_set.compiled_data:
+            interpolator = live_interpolators.get(live_key(interpolation_set))
+
+        if interpolator is not None:
+            # Requests may still be evaluating the cached interpolator, so it is never edited in place
+            interpolator = LagrangeInterpolator.from_compiled(interpolator.compile())
+            try:
+                for x in removed:
+                    interpolator.remove_point(x)
+                for x, y in added:
+                    interpolator.add_point(x, y)
+            except ValueError:
+                interpolator = None
+
+        interpolator = interpolation_set.store_compiled(interpolator)
+        if interpolator is not None:
+            live_interpolators.put(live_key(interpolation_set), interpolator)
+
+
+def schedule_refresh(set_ids):
+    """
+    Mark the given sets uncompiled and rebuild them once the current transaction commits
+    The mark is part of the transaction, so a rollback discards it along with the callbacks;
+    sets already rebuilt by an earlier callback (or a request) are skipped
+    """
+    set_ids = list(set_ids)
+    if not set_ids:
+        return
+    InterpolationSet.objects.filter(pk__in=set_ids).update(
+        compiled_data=None,
+        compiled_coefficients=None,
+        compiled_version=F('compiled_version') + 1
+    )
+
+    def refresh():
+        for interpolation_set in InterpolationSet.objects.filter(pk__in=set_ids, compiled_data__isnull=True):
+            refresh_compiled(interpolation_set)
+
+    transaction.on_commit(refresh)
+
+
+@receiver(m2m_changed, sender=InterpolationSet.points.through)
+def set_points_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if reverse:
+        # point.sets.add(...) and friends: `instance` is the point, `pk_set` the sets
+        if action == 'pre_clear':
+            instance._cleared_set_ids = list(instance.sets.values_list('pk', flat=True))
+        elif action == 'post_clear':
+            schedule_refresh(getattr(instance, '_cleared_set_ids', []))
+        elif action in ('post_add', 'post_remove'):
+            schedule_refresh(pk_set)
+        return
+
+    if action == 'post_add':
+        refresh_compiled(instance, added=model.objects.filter(pk__in=pk_set).values_list('x', 'y'))
+    elif action == 'post_remove':
+        refresh_compiled(instance, removed=model.objects.filter(pk__in=pk_set).values_list('x', flat=True))
+    elif action == 'post_clear':
+        refresh_compiled(instance)
+
+
+@receiver(post_save, sender=InterpolationPoint)
+def point_saved(sender, instance, created, **kwargs):
+    if not created:
+        schedule_refresh(instance.sets.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=InterpolationPoint)
+def point_deleted(sender, instance, **kwargs):
+    schedule_refresh(instance.sets.values_list('pk', flat=True))
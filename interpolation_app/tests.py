@@ -1,3 +1,351 @@
-from django.test import TestCase
+import pickle
 
-# Create your tests here.
+import numpy as np
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from .admission import admission
+from .cache import live_interpolators
+from .lagrange import EVAL_BLOCK_ELEMENTS, CompiledEvaluator, LagrangeInterpolator, barycentric_evaluate, solve_vandermonde
+from .models import InterpolationPoint, InterpolationSet
+from .serializers import InterpolationRequestSerializer
+from .views import get_live_interpolator
+
+
+class SignalRefreshTests(TransactionTestCase):
+    """Compiled set data follows point changes (TransactionTestCase so on_commit callbacks run)"""
+
+    def setUp(self):
+        self.set = InterpolationSet.objects.create(name='signals')
+        self.points = [InterpolationPoint.objects.create(x=x, y=y) for x, y in [(0, 1), (1, 3), (2, 2)]]
+        self.set.points.add(*self.points)
+
+    def assertMatchesStoredPoints(self):
+        interpolation_set = InterpolationSet.objects.get(pk=self.set.pk)
+        evaluator = interpolation_set.get_compiled_evaluator()
+        self.assertIsNotNone(evaluator)
+        expected = LagrangeInterpolator(interpolation_set.get_points_list())
+        grid = np.linspace(-1, 3, 9)
+        np.testing.assert_allclose(evaluator(grid), expected.evaluate_array(grid), rtol=1e-12, atol=1e-12)
+        return interpolation_set
+
+    def test_add_and_remove(self):
+        interpolation_set = self.assertMatchesStoredPoints()
+        # Load the live interpolator so the membership edits are applied incrementally
+        get_live_interpolator(interpolation_set)
+
+        point = InterpolationPoint.objects.create(x=4, y=5)
+        self.set.points.add(point)
+        self.assertEqual(len(self.assertMatchesStoredPoints().compiled_data) // 24, 4)
+
+        self.set.points.remove(point)
+        self.assertEqual(len(self.assertMatchesStoredPoints().compiled_data) // 24, 3)
+
+    def test_edit_and_delete(self):
+        point = self.points[2]
+        point.y = 50
+        point.save()
+        self.assertMatchesStoredPoints()
+
+        self.points[0].delete()
+        self.assertEqual(len(self.assertMatchesStoredPoints().compiled_data) // 24, 2)
+
+    def test_rolled_back_edit_does_not_block_later_refreshes(self):
+        point = self.points[2]
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                point.y = 40
+                point.save()
+                raise RuntimeError
+
+        point.y = 50
+        point.save()
+        self.assertMatchesStoredPoints()
+        self.assertEqual(get_live_interpolator(InterpolationSet.objects.get(pk=self.set.pk)).interpolate(2), 50)
+
+    def test_rolled_back_add_is_not_served_after_a_later_edit(self):
+        interpolation_set = InterpolationSet.objects.get(pk=self.set.pk)
+        get_live_interpolator(interpolation_set)
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.set.points.add(InterpolationPoint.objects.create(x=10, y=0))
+                raise RuntimeError
+
+        # Read before the refresh callback runs, as a request in the same transaction would
+        with transaction.atomic():
+            point = self.points[0]
+            point.y = 7
+            point.save()
+            interpolator = get_live_interpolator(InterpolationSet.objects.get(pk=self.set.pk))
+            self.assertEqual(interpolator.points, [(0.0, 7.0), (1.0, 3.0), (2.0, 2.0)])
+        interpolator = get_live_interpolator(InterpolationSet.objects.get(pk=self.set.pk))
+        self.assertEqual(interpolator.points, [(0.0, 7.0), (1.0, 3.0), (2.0, 2.0)])
+
+    def test_edits_in_one_transaction_rebuild_once(self):
+        with transaction.atomic():
+            for point in self.points:
+                point.y += 1
+                point.save()
+            version = InterpolationSet.objects.get(pk=self.set.pk).compiled_version
+        self.assertEqual(InterpolationSet.objects.get(pk=self.set.pk).compiled_version, version + 1)
+        self.assertMatchesStoredPoints()
+
+    def test_incremental_edit_does_not_touch_shared_interpolator(self):
+        interpolation_set = InterpolationSet.objects.get(pk=self.set.pk)
+        shared = get_live_interpolator(interpolation_set)
+        self.set.points.add(InterpolationPoint.objects.create(x=4, y=5))
+        self.assertEqual(shared.n, 3)
+        self.assertEqual(shared.weights.shape, (3,))
+
+    def test_uninterpolable_set_is_compiled_once(self):
+        interpolation_set = InterpolationSet.objects.create(name='single')
+        interpolation_set.points.add(InterpolationPoint.objects.create(x=1, y=1))
+        client = APIClient()
+        versions = []
+        for _ in range(3):
+            response = client.post(f'/api/sets/{interpolation_set.pk}/interpolate/', {}, format='json')
+            self.assertEqual(response.status_code, 400)
+            versions.append(InterpolationSet.objects.get(pk=interpolation_set.pk).compiled_version)
+        self.assertEqual(len(set(versions)), 1)
+
+    def tearDown(self):
+        live_interpolators.clear()
+
+
+class SolveVandermondeTests(TestCase):
+
+    def test_matches_polyfit(self):
+        rng = np.random.default_rng(0)
+        for n in (2, 5, 10):
+            x = np.sort(rng.uniform(-2, 2, n))
+            y = rng.normal(size=n)
+            expected = np.polyfit(x, y, n - 1)[::-1]
+            np.testing.assert_allclose(solve_vandermonde(x, y), expected, rtol=1e-8, atol=1e-10)
+
+    def test_ill_conditioned_monomial_basis_is_rejected(self):
+        x = np.linspace(0, 100, 40)
+        interpolator = LagrangeInterpolator.from_arrays(x, np.sin(x))
+        with self.assertRaisesMessage(ValueError, "basis='chebyshev'"):
+            interpolator.get_polynomial_coefficients()
+
+
+class AdmissionTests(TestCase):
+    points = [[x, x * x] for x in range(10)]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def post(self, **data):
+        return self.client.post('/api/interpolate/', dict({'points': self.points}, **data), format='json')
+
+    def test_cheap_request_is_admitted(self):
+        self.assertEqual(self.post(include=['coefficients']).status_code, 200)
+
+    @override_settings(INTERPOLATION_ADMISSION={'MAX_COST': 1e4, 'LIGHT_MAX_COST': 1e3})
+    def test_over_budget_is_413(self):
+        response = self.post(include=['evaluation'], num_points=10000)
+        self.assertEqual(response.status_code, 413)
+        self.assertNotIn('Retry-After', response)
+
+    @override_settings(INTERPOLATION_ADMISSION={'MAX_RESPONSE_VALUES': 1000})
+    def test_oversized_response_is_413(self):
+        response = self.post(include=['evaluation'], num_points=10000)
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()['max_response_values'], 1000)
+
+    @override_settings(INTERPOLATION_ADMISSION={'LIGHT_MAX_COST': 1e3, 'HEAVY_CONCURRENCY': 1})
+    def test_full_heavy_lane_is_429(self):
+        with admission.admit(1e4):
+            response = self.post(include=['evaluation'], num_points=1000)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(self.post(include=['evaluation'], num_points=1000).status_code, 200)
+
+
+class StreamingTests(TestCase):
+    points = [[0, 1], [1, 3], [2, 2]]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_large_grids_must_be_streamed(self):
+        response = self.client.post('/api/interpolate/', {'points': self.points, 'num_points': 10 ** 9}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_binary_stream_computes_only_the_evaluation(self):
+        serializer = InterpolationRequestSerializer(data={'points': self.points, 'stream': 'binary'})
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data['include'], ['evaluation'])
+
+        serializer = InterpolationRequestSerializer(
+            data={'points': self.points, 'stream': 'binary', 'integral_bounds': [[0, 1]]}
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('integral_bounds', serializer.errors)
+
+    def test_binary_stream_rows(self):
+        response = self.client.post(
+            '/api/interpolate/', {'points': self.points, 'stream': 'binary', 'num_points': 5}, format='json'
+        )
+        rows = np.frombuffer(b''.join(response.streaming_content), dtype='<f8').reshape(-1, 2)
+        np.testing.assert_allclose(rows[:, 0], np.linspace(-1, 3, 5))
+        np.testing.assert_allclose(rows[:, 1], LagrangeInterpolator(self.points).evaluate_array(rows[:, 0]))
+
+
+class BatchTests(TestCase):
+
+    def test_grouped_jobs_match_single_jobs(self):
+        client = APIClient()
+        job = {'points': [[0, 1], [1, 3], [2, 2]], 'x_values': [0.123456789], 'include': ['evaluation'],
+               'precision': 'float32'}
+        other = dict(job, points=[[0, 2], [1, 1], [2, 5]])
+        grouped = client.post('/api/interpolate/batch/', {'jobs': [job, other]}, format='json').json()['results']
+        single = client.post('/api/interpolate/', job, format='json').json()
+        self.assertEqual(grouped[0]['evaluation_points'], [0.123456789])
+        self.assertEqual(grouped[0]['evaluation_points'], single['evaluation_points'])
+        self.assertEqual(grouped[0]['evaluation_results'], single['evaluation_results'])
+
+
+def product_form(points, x):
+    """The original Lagrange evaluation: sum of y_j times the j-th basis product"""
+    interpolator = LagrangeInterpolator(points)
+    return sum(y * interpolator.lagrange_basis(x, j) for j, (_, y) in enumerate(interpolator.points))
+
+
+class BarycentricEvaluationTests(TestCase):
+    points = [(-1.5, 2.0), (0.0, -1.0), (0.5, 0.25), (2.0, 3.0), (3.5, -2.0)]
+
+    def test_matches_product_formula(self):
+        interpolator = LagrangeInterpolator(self.points)
+        for x in np.linspace(-2, 4, 25):
+            self.assertAlmostEqual(interpolator.interpolate(x), product_form(self.points, x), places=10)
+
+    def test_nodes_return_their_values(self):
+        interpolator = LagrangeInterpolator(self.points)
+        for x, y in self.points:
+            self.assertEqual(interpolator.interpolate(x), y)
+
+
+class BlockedEvaluationTests(TestCase):
+
+    def test_grid_spanning_several_blocks(self):
+        points = [(x, np.sin(x)) for x in np.linspace(0, 3, 20)]
+        interpolator = LagrangeInterpolator(points)
+        # More than EVAL_BLOCK_ELEMENTS / n rows, with every node on the grid
+        grid = np.concatenate([np.linspace(0, 3, 2 * EVAL_BLOCK_ELEMENTS // 20 + 7), interpolator.x_values])
+        expected = np.array([interpolator.interpolate(x) for x in grid])
+        np.testing.assert_allclose(interpolator.evaluate_array(grid), expected, rtol=1e-10, atol=1e-10)
+        np.testing.assert_array_equal(interpolator.evaluate_array(interpolator.x_values), interpolator.y_values)
+
+
+class IncrementalUpdateTests(TestCase):
+    points = [(0.0, 1.0), (1.0, 3.0), (2.0, 2.0), (4.0, 5.0)]
+
+    def assertSamePolynomial(self, interpolator, points):
+        rebuilt = LagrangeInterpolator(points)
+        np.testing.assert_array_equal(interpolator.x_values, rebuilt.x_values)
+        # Weights are only defined up to a common factor
+        np.testing.assert_allclose(interpolator.weights / interpolator.weights[0],
+                                   rebuilt.weights / rebuilt.weights[0], rtol=1e-12)
+        grid = np.linspace(-1, 5, 13)
+        np.testing.assert_allclose(interpolator.evaluate_array(grid), rebuilt.evaluate_array(grid), rtol=1e-12)
+
+    def test_add_point_matches_rebuild(self):
+        interpolator = LagrangeInterpolator(self.points)
+        self.assertEqual(interpolator.add_point(3.0, -1.0), 3)
+        interpolator.add_point(-1.0, 0.5)
+        self.assertSamePolynomial(interpolator, self.points + [(3.0, -1.0), (-1.0, 0.5)])
+
+    def test_remove_point_matches_rebuild(self):
+        interpolator = LagrangeInterpolator(self.points)
+        self.assertEqual(interpolator.remove_point(1.0), (1.0, 3.0))
+        self.assertSamePolynomial(interpolator, [p for p in self.points if p[0] != 1.0])
+
+    def test_invalid_updates_are_rejected(self):
+        interpolator = LagrangeInterpolator(self.points)
+        with self.assertRaises(ValueError):
+            interpolator.add_point(2.0, 0.0)
+        with self.assertRaises(ValueError):
+            interpolator.remove_point(3.0)
+
+
+def cubic(x):
+    return 2 * x ** 3 - x + 3
+
+
+class ChebyshevTests(TestCase):
+
+    def test_cubic_in_chebyshev_basis(self):
+        x = np.array([-1.0, 0.0, 1.5, 2.0, 3.0])
+        chebyshev = LagrangeInterpolator.from_arrays(x, cubic(x)).to_chebyshev()
+        self.assertEqual(chebyshev.domain, (-1.0, 3.0))
+        grid = np.linspace(-1, 3, 17)
+        np.testing.assert_allclose(chebyshev(grid), cubic(grid), rtol=1e-12, atol=1e-12)
+        # The degree-4 coefficient of an interpolated cubic vanishes
+        np.testing.assert_allclose(chebyshev.to_monomial(), [3, -1, 0, 2, 0], atol=1e-11)
+
+
+class CompiledEvaluatorTests(TestCase):
+    points = [(-1.5, 2.0), (0.0, -1.0), (0.5, 0.25), (2.0, 3.0), (3.5, -2.0)]
+
+    def test_barycentric_evaluate_matches_product_formula(self):
+        interpolator = LagrangeInterpolator(self.points)
+        grid = np.concatenate([np.linspace(-2, 4, 25), interpolator.x_values])
+        result = barycentric_evaluate(interpolator.x_values, interpolator.y_values, interpolator.weights, grid)
+        np.testing.assert_allclose(result, [product_form(self.points, x) for x in grid], rtol=1e-10, atol=1e-10)
+        # Queries exactly on a node return the stored value
+        np.testing.assert_array_equal(result[-len(self.points):], interpolator.y_values)
+
+    def test_pickle_round_trip(self):
+        evaluator = LagrangeInterpolator(self.points).compile()
+        restored = pickle.loads(pickle.dumps(evaluator))
+        self.assertIsInstance(restored, CompiledEvaluator)
+        np.testing.assert_array_equal(restored.weights, evaluator.weights)
+        grid = np.linspace(-2, 4, 9)
+        np.testing.assert_array_equal(restored(grid), evaluator(grid))
+        np.testing.assert_array_equal(CompiledEvaluator.from_bytes(evaluator.to_bytes())(grid), evaluator(grid))
+
+    def test_immutable(self):
+        evaluator = LagrangeInterpolator(self.points).compile()
+        with self.assertRaises(AttributeError):
+            evaluator.nodes = np.zeros(5)
+        with self.assertRaises(ValueError):
+            evaluator.weights[0] = 0.0
+
+
+class NodeStorageTests(TestCase):
+
+    def test_nodes_are_sorted_into_one_array(self):
+        interpolator = LagrangeInterpolator.from_arrays([2.0, 0.0, 1.0], [5.0, 1.0, 3.0])
+        self.assertEqual(interpolator.points, [(0.0, 1.0), (1.0, 3.0), (2.0, 5.0)])
+        # x and y are row views of one (2, n) array
+        self.assertIs(interpolator.x_values.base, interpolator.y_values.base)
+        self.assertFalse(hasattr(interpolator, '__dict__'))
+
+    def test_duplicates_are_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'Duplicate x-coordinates'):
+            LagrangeInterpolator([(0, 1), (1, 2), (0, 3)])
+
+
+class CalculusTests(TestCase):
+
+    def setUp(self):
+        x = np.array([-1.0, 0.0, 1.5, 2.0, 3.0])
+        self.interpolator = LagrangeInterpolator.from_arrays(x, cubic(x))
+
+    def test_derivatives(self):
+        grid = np.linspace(-1, 3, 11)
+        np.testing.assert_allclose(self.interpolator.derivative(grid), 6 * grid ** 2 - 1, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(self.interpolator.derivative(grid, order=2), 12 * grid, rtol=1e-9, atol=1e-8)
+        np.testing.assert_allclose(self.interpolator.derivative(grid, order=4), 0, atol=1e-7)
+
+    def test_integrals(self):
+        def antiderivative(x):
+            return x ** 4 / 2 - x ** 2 / 2 + 3 * x
+        self.assertAlmostEqual(self.interpolator.integrate(0, 2), antiderivative(2) - antiderivative(0), places=10)
+        np.testing.assert_allclose(
+            self.interpolator.integrate(np.array([-1.0, 0.5]), np.array([3.0, 1.0])),
+            [antiderivative(3) - antiderivative(-1), antiderivative(1) - antiderivative(0.5)],
+            rtol=1e-12
+        )
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import async_views, views
 from .debug_views import debug_info
 
 # Create a router and register our viewsets with it.
@@ -21,6 +21,11 @@ urlpatterns = [
     
     # Direct interpolation API
     path('api/interpolate/', views.InterpolationAPIView.as_view(), name='interpolate'),
+    path('api/interpolate/batch/', views.InterpolationBatchView.as_view(), name='interpolate-batch'),
+    
+    # Async variants for ASGI deployments (numeric work runs in a bounded executor)
+    path('api/async/interpolate/', async_views.AsyncInterpolationView.as_view(), name='interpolate-async'),
+    path('api/async/sets/<int:pk>/interpolate/', async_views.AsyncInterpolationSetView.as_view(), name='set-interpolate-async'),
     
     # Odoo integration
     path('api/odoo/send/', views.OdooIntegrationView.as_view(), name='odoo-integration'),
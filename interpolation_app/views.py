@@ -1,7 +1,9 @@
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from django.conf import settings
 from django.shortcuts import render
@@ -9,15 +11,114 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 import requests
 import json
+import numpy as np
 
+from .admission import AdmissionRejected, admission
 from .models import InterpolationPoint, InterpolationSet, LagrangeResult
+from .parsers import binary_parser_classes
+from .renderers import ArrayJSONEncoder, binary_renderer_classes
 from .serializers import (
     InterpolationPointSerializer,
     InterpolationSetSerializer,
     LagrangeResultSerializer,
-    InterpolationRequestSerializer
+    InterpolationBatchSerializer,
+    InterpolationRequestSerializer,
+    InterpolationSectionsSerializer
 )
-from .lagrange import LagrangeInterpolator
+from .cache import (
+    get_cached_response,
+    interpolator_cache,
+    live_interpolators,
+    live_key,
+    response_cache_config,
+    response_cache_key,
+    store_response
+)
+from .lagrange import (
+    LagrangeInterpolator,
+    PiecewiseLagrangeInterpolator,
+    adaptive_sample,
+    evaluate_many,
+    resolve_precision
+)
+
+# Grid points evaluated and sent per chunk by streaming responses
+STREAM_CHUNK_POINTS = 2 ** 16
+
+def get_live_interpolator(interpolation_set):
+    """
+    Return the live interpolator for a stored set, loading it from the set's compiled data
+    (compiling uncompiled sets on first use); None if the set cannot be interpolated
+    """
+    if interpolation_set.compiled_data is None:
+        interpolator = interpolation_set.store_compiled()
+        if interpolator is None:
+            return None
+    else:
+        if not interpolation_set.compiled_data:
+            return None
+        interpolator = live_interpolators.get(live_key(interpolation_set))
+        if interpolator is not None:
+            return interpolator
+        interpolator = LagrangeInterpolator.from_compiled(
+            interpolation_set.get_compiled_evaluator(), interpolation_set.get_compiled_coefficients()
+        )
+    
+    live_interpolators.put(live_key(interpolation_set), interpolator)
+    return interpolator
+
+def set_interpolation_sections(interpolator, options, params):
+    """
+    Compute the requested sections of a stored set's interpolation: `options` is the validated
+    InterpolationSectionsSerializer data, `params` the request parameters (for x_values)
+    Touches no database state, so it can also run in an executor
+    """
+    include = options['include']
+    sections = {'x_values': [], 'y_values': [], 'coefficients': []}
+    
+    # Get evaluation points from request, or use default range
+    if 'evaluation' in include:
+        x_values = params.get('x_values', [])
+        if not x_values:
+            x_min = interpolator.x_values[0] - 1
+            x_max = interpolator.x_values[-1] + 1
+            sections['x_values'], sections['y_values'] = interpolator.interpolate_range(x_min, x_max, 100)
+        else:
+            sections['x_values'] = x_values
+            sections['y_values'] = interpolator.evaluate_at_points(x_values)
+    
+    if 'coefficients' in include:
+        sections['coefficients'] = interpolator.get_polynomial_coefficients()
+    
+    # Get animation data
+    if 'animation' in include:
+        sections['animation_data'] = interpolator.get_animation_data()
+    if 'terms' in include:
+        sections['lagrange_terms_details'] = interpolator.get_lagrange_terms_details(
+            options['terms_offset'], options['terms_limit']
+        )
+    sections['original_points'] = interpolator.points
+    return sections
+
+def set_interpolation_response(result_id, sections, include):
+    """Response body of a set interpolation, in the order the endpoint has always used"""
+    response_data = {'result_id': result_id}
+    if 'coefficients' in include:
+        response_data['coefficients'] = sections['coefficients']
+    if 'evaluation' in include:
+        response_data['evaluation_points'] = sections['x_values']
+        response_data['evaluation_results'] = sections['y_values']
+    for key in ('animation_data', 'lagrange_terms_details', 'original_points'):
+        if key in sections:
+            response_data[key] = sections[key]
+    return response_data
+
+def admission_rejected_response(error):
+    """413 / 429 response for a request refused by admission control"""
+    response = Response(error.as_dict(), status=error.status_code)
+    if error.retry_after is not None:
+        response['Retry-After'] = str(error.retry_after)
+    return response
 
 def index(request):
     """Serve the main HTML interface"""
@@ -51,53 +152,65 @@ class InterpolationSetViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
-    def interpolate(self, request, pk=None):
-        """Perform Lagrange interpolation on the set"""
+    def remove_point(self, request, pk=None):
+        """Remove the point with the given x coordinate from the interpolation set"""
         interpolation_set = self.get_object()
-        points = interpolation_set.get_points_list()
+        x = request.data.get('x')
         
-        if len(points) < 2:
+        if x is None:
             return Response(
-                {'error': 'At least 2 points are required for interpolation'},
+                {'error': 'The x coordinate of the point to remove is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        removed = list(interpolation_set.points.filter(x=float(x)))
+        if not removed:
+            return Response(
+                {'error': f'No point with x = {x} in this set'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        interpolation_set.points.remove(*removed)
+        
+        serializer = self.get_serializer(interpolation_set)
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['post'])
+    def interpolate(self, request, pk=None):
+        """Perform Lagrange interpolation on the set"""
+        interpolation_set = self.get_object()
+        sections_serializer = InterpolationSectionsSerializer(data=request.data, context={'request': request})
+        if not sections_serializer.is_valid():
+            return Response(sections_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        include = sections_serializer.validated_data['include']
+        
         try:
-            interpolator = LagrangeInterpolator(points)
-            
-            # Get evaluation points from request, or use default range
-            x_values = request.data.get('x_values', [])
-            if not x_values:
-                x_min = min(p[0] for p in points) - 1
-                x_max = max(p[0] for p in points) + 1
-                x_values, y_values = interpolator.interpolate_range(x_min, x_max, 100)
-            else:
-                y_values = interpolator.evaluate_at_points(x_values)
+            interpolator = get_live_interpolator(interpolation_set)
+            if interpolator is None:
+                points = interpolation_set.get_points_list()
+                if len(points) < 2:
+                    return Response(
+                        {'error': 'At least 2 points are required for interpolation'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                # Surfaces the reason the stored points cannot be interpolated (e.g. duplicates)
+                LagrangeInterpolator(points)
+            sections = set_interpolation_sections(interpolator, sections_serializer.validated_data, request.data)
             
-            # Get polynomial coefficients
-            coefficients = interpolator.get_polynomial_coefficients()
+            # Polynomial coefficients are stored on the set once per version of its points
+            if 'coefficients' in include and not interpolation_set.compiled_coefficients:
+                interpolation_set.store_coefficients(sections['coefficients'])
             
             # Save result
             result = LagrangeResult.objects.create(
                 interpolation_set=interpolation_set
             )
-            result.set_coefficients(coefficients)
-            result.set_evaluation_data(x_values, y_values)
+            result.set_coefficients(sections['coefficients'])
+            result.set_evaluation_data(sections['x_values'], sections['y_values'])
             result.save()
             
-            # Get animation data
-            animation_data = interpolator.get_animation_data()
-            lagrange_terms_details = interpolator.get_lagrange_terms_details()
-            
-            return Response({
-                'result_id': result.id,
-                'coefficients': coefficients,
-                'evaluation_points': x_values,
-                'evaluation_results': y_values,
-                'animation_data': animation_data,
-                'lagrange_terms_details': lagrange_terms_details,
-                'original_points': points
-            })
+            live_interpolators.trim()
+            return Response(set_interpolation_response(result.id, sections, include))
             
         except Exception as e:
             return Response(
@@ -113,49 +226,342 @@ class LagrangeResultViewSet(viewsets.ReadOnlyModelViewSet):
 class InterpolationAPIView(APIView):
     """
     Direct API for Lagrange interpolation without saving to database
+    Successful responses can be cached as rendered bytes (INTERPOLATION_RESPONSE_CACHE)
+    Requests and responses may be JSON, .npz or msgpack (if installed) with typed arrays
     """
     
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + binary_parser_classes()
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + binary_renderer_classes()
+    response_cache_key = None
+    
     def post(self, request):
-        serializer = InterpolationRequestSerializer(data=request.data)
+        serializer = InterpolationRequestSerializer(data=request.data, context={'request': request})
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         data = serializer.validated_data
-        points = [(p[0], p[1]) for p in data['points']]
-        x_values = data.get('x_values', [])
         
+        if response_cache_config()['ENABLED']:
+            self.response_cache_key = response_cache_key(data, request.accepted_media_type)
+            cached = get_cached_response(self.response_cache_key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response['X-Interpolation-Cache'] = 'hit'
+                return response
+        
+        try:
+            ticket = admission.admit(serializer.cost, serializer.response_values)
+        except AdmissionRejected as e:
+            return admission_rejected_response(e)
+        
+        streaming = False
         try:
-            interpolator = LagrangeInterpolator(points)
+            response_data, evaluate, derivative = self.interpolation_result(data)
+            if data['stream']:
+                response = self.stream_response(
+                    evaluate, data.get('x_values', []), data['points'], data,
+                    resolve_precision(data['precision']), response_data, derivative
+                )
+                # A heavy slot stays taken until the stream is exhausted or closed
+                response.streaming_content = ticket.wrap(response.streaming_content)
+                streaming = True
+                return response
+            return Response(response_data)
             
-            # Generate evaluation points if not provided
-            if not x_values:
-                x_min = min(p[0] for p in points) - 1
-                x_max = max(p[0] for p in points) + 1
-                x_values, y_values = interpolator.interpolate_range(x_min, x_max, 100)
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        finally:
+            if not streaming:
+                ticket.release()
+    
+    def interpolation_result(self, data):
+        """
+        Compute the requested sections for one validated request
+        Returns the response data and the evaluate / derivative callables used for streaming
+        (evaluation is left to the stream when data['stream'] is set)
+        """
+        # Arrays from the binary parsers are used as they are
+        points = data['points']
+        if not isinstance(points, np.ndarray):
+            points = [(p[0], p[1]) for p in points]
+        x_values = data.get('x_values', [])
+        basis = data['basis']
+        dtype = resolve_precision(data['precision'])
+        
+        if data['mode'] == 'piecewise':
+            return self.piecewise_result(points, x_values, data, dtype)
+        
+        include = data['include']
+        interpolator = interpolator_cache.get_or_build(points)
+        response_data = {'success': True}
+        
+        # Only the requested sections are computed
+        if basis == 'chebyshev':
+            # High-degree sets: evaluate and report the stable Chebyshev representation
+            chebyshev = interpolator.to_chebyshev()
+            evaluate = chebyshev
+            if 'coefficients' in include:
+                response_data['coefficients'] = chebyshev.coefficients.tolist()
+        else:
+            evaluate = interpolator.evaluate_array
+            if 'coefficients' in include:
+                response_data['coefficients'] = interpolator.get_polynomial_coefficients()
+        response_data['basis'] = basis
+        
+        # Evaluation grids stay ndarrays in the requested precision until rendering;
+        # derivatives are reported on the same grid, so they need it too
+        if not data['stream'] and ('evaluation' in include or data['derivative_order']):
+            x_values, y_values = self.evaluation_grid(evaluate, x_values, points, data, dtype)
+            response_data['evaluation_points'] = x_values
+            if 'evaluation' in include:
+                response_data['evaluation_results'] = y_values
+        response_data['precision'] = dtype.name
+        
+        if 'animation' in include:
+            if data['animation_format'] == 'frames':
+                response_data['animation_data'] = interpolator.get_animation_data()
             else:
-                y_values = interpolator.evaluate_at_points(x_values)
+                response_data['animation_data'] = interpolator.get_compact_animation_data(
+                    quantize=data['animation_format'] == 'quantized'
+                )
+        if 'terms' in include:
+            response_data['lagrange_terms_details'] = interpolator.get_lagrange_terms_details(
+                data['terms_offset'], data['terms_limit']
+            )
+        
+        response_data['original_points'] = points
+        response_data['polynomial_degree'] = len(points) - 1
+        if basis == 'chebyshev' and 'coefficients' in include:
+            response_data['chebyshev_domain'] = list(chebyshev.domain)
+        
+        # Slopes and areas computed server-side instead of from dense client grids
+        derivative = None
+        if data['derivative_order']:
+            response_data['derivative_order'] = data['derivative_order']
+            derivative = lambda x, dtype: interpolator.derivative(x, data['derivative_order'], dtype)
+            if not data['stream']:
+                response_data['derivative_results'] = derivative(x_values, dtype)
+        if data.get('integral_bounds'):
+            bounds = np.asarray(data['integral_bounds'], dtype=float)
+            response_data['integrals'] = interpolator.integrate(bounds[:, 0], bounds[:, 1]).tolist()
+        
+        # Memoized coefficients and frames have grown the entry; re-check the byte budget
+        interpolator_cache.trim()
+        return response_data, evaluate, derivative
+
+    def grid_bounds(self, points, data):
+        """Interval of the default grid: x_min / x_max, else the data range widened by 1"""
+        nodes = np.asarray(points, dtype=float)[:, 0]
+        x_min = data['x_min'] if data['x_min'] is not None else nodes.min() - 1
+        x_max = data['x_max'] if data['x_max'] is not None else nodes.max() + 1
+        return x_min, x_max
+    
+    def evaluation_grid(self, evaluate, x_values, points, data, dtype):
+        """
+        Evaluate at the requested x values, or on a default grid over the data range
+        (uniform with num_points samples, or adaptively refined when sampling is 'adaptive')
+        Requested x values are returned unchanged; only the results use the requested precision
+        """
+        if len(x_values):
+            return np.asarray(x_values, dtype=np.float64), evaluate(x_values, dtype)
+        
+        x_min, x_max = self.grid_bounds(points, data)
+        if data['sampling'] == 'adaptive':
+            x_range, y_range = adaptive_sample(evaluate, x_min, x_max, data['tolerance'], data['max_samples'])
+            return x_range.astype(dtype), y_range.astype(dtype)
+        
+        x_range = np.linspace(x_min, x_max, data['num_points'])
+        return x_range.astype(dtype), evaluate(x_range, dtype)
+    
+    def grid_chunks(self, x_values, points, data):
+        """
+        Return the grid size and a generator of grid chunks of at most STREAM_CHUNK_POINTS;
+        the uniform grid is generated piece by piece with the same values as np.linspace
+        """
+        if len(x_values):
+            x_values = np.asarray(x_values, dtype=float)
+            return x_values.shape[0], (
+                x_values[start:start + STREAM_CHUNK_POINTS]
+                for start in range(0, x_values.shape[0], STREAM_CHUNK_POINTS)
+            )
+        
+        x_min, x_max = self.grid_bounds(points, data)
+        count = data['num_points']
+        step = (x_max - x_min) / (count - 1)
+        
+        def chunks():
+            for start in range(0, count, STREAM_CHUNK_POINTS):
+                stop = min(start + STREAM_CHUNK_POINTS, count)
+                chunk = x_min + np.arange(start, stop) * step
+                if stop == count:
+                    chunk[-1] = x_max
+                yield chunk
+        return count, chunks()
+    
+    def stream_response(self, evaluate, x_values, points, data, dtype, header, derivative=None):
+        """
+        Stream the evaluation chunk by chunk, so only one chunk is held in memory at a time
+        'ndjson': a header line with the other sections, then one {"x", "y"[, "derivative"]} line per chunk
+        (requested x values are sent unchanged)
+        'binary': little-endian rows of (x, y[, derivative]) in the requested precision
+        """
+        requested = len(x_values) > 0
+        count, chunks = self.grid_chunks(x_values, points, data)
+        little_endian = np.dtype(dtype).newbyteorder('<')
+        
+        if data['stream'] == 'binary':
+            columns = ['x', 'y'] + (['derivative'] if derivative else [])
             
-            # Get additional data
-            coefficients = interpolator.get_polynomial_coefficients()
-            animation_data = interpolator.get_animation_data()
-            lagrange_terms_details = interpolator.get_lagrange_terms_details()
+            def body():
+                for x in chunks:
+                    rows = [x, evaluate(x, dtype)] + ([derivative(x, dtype)] if derivative else [])
+                    yield np.column_stack(rows).astype(little_endian).tobytes()
             
-            return Response({
+            response = StreamingHttpResponse(body(), content_type='application/octet-stream')
+            response['X-Interpolation-Count'] = str(count)
+            response['X-Interpolation-Dtype'] = little_endian.str
+            response['X-Interpolation-Columns'] = ','.join(columns)
+            return response
+        
+        header['count'] = count
+        
+        def lines():
+            yield json.dumps(header, cls=ArrayJSONEncoder) + '\n'
+            for x in chunks:
+                line = {'x': x if requested else x.astype(dtype), 'y': evaluate(x, dtype)}
+                if derivative:
+                    line['derivative'] = derivative(x, dtype)
+                yield json.dumps(line, cls=ArrayJSONEncoder) + '\n'
+        
+        return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+    
+    def piecewise_result(self, points, x_values, data, dtype=np.float64):
+        """Evaluate large point sets with local Lagrange windows instead of a global polynomial"""
+        interpolator = PiecewiseLagrangeInterpolator(points, degree=data['local_degree'])
+        response_data = {
+            'success': True,
+            'mode': 'piecewise',
+            'local_degree': interpolator.degree,
+        }
+        if not data['stream']:
+            x_values, y_values = self.evaluation_grid(interpolator.evaluate_array, x_values, points, data, dtype)
+            response_data['evaluation_points'] = x_values
+            response_data['evaluation_results'] = y_values
+        response_data['precision'] = np.dtype(dtype).name
+        response_data['points_count'] = interpolator.n
+        return response_data, interpolator.evaluate_array, None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.response_cache_key and isinstance(response, Response) and response.status_code == 200:
+            # Render now so the exact bytes can be stored; Django will not render twice
+            response.render()
+            stored = store_response(self.response_cache_key, response.content, response['Content-Type'])
+            response['X-Interpolation-Cache'] = 'miss' if stored else 'skip'
+        return response
+
+@method_decorator(csrf_exempt, name='dispatch')
+class InterpolationBatchView(InterpolationAPIView):
+    """
+    Several independent interpolation requests in one round trip
+    Jobs of the same size that only ask for evaluation on the same x values are evaluated
+    together with evaluate_many; every job gets its own result or errors, in request order
+    """
+    
+    def post(self, request):
+        serializer = InterpolationBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        jobs = serializer.validated_data['jobs']
+        results = [None] * len(jobs)
+        validated = {}
+        cost, values = 0.0, 0
+        for index, job in enumerate(jobs):
+            job_serializer = InterpolationRequestSerializer(data=job)
+            if not job_serializer.is_valid():
+                results[index] = {'success': False, 'errors': job_serializer.errors}
+            elif job_serializer.validated_data['stream']:
+                results[index] = {'success': False, 'errors': {'stream': ['Batch jobs cannot be streamed.']}}
+            else:
+                validated[index] = job_serializer.validated_data
+                cost += job_serializer.cost
+                values += job_serializer.response_values
+        
+        # The batch is admitted as a whole
+        try:
+            ticket = admission.admit(cost, values)
+        except AdmissionRejected as e:
+            return admission_rejected_response(e)
+        
+        with ticket:
+            self.process_jobs(validated, results)
+        return Response({'success': True, 'results': results})
+    
+    def process_jobs(self, validated, results):
+        """Fill `results` for the validated jobs, vectorized where shapes allow"""
+        for indices, group in self.shared_grid_groups(validated):
+            try:
+                group_results = self.evaluate_group(group)
+            except ValueError:
+                # e.g. duplicate x-coordinates in one job; those jobs report their own errors below
+                continue
+            for index, result in zip(indices, group_results):
+                results[index] = result
+        
+        for index, data in validated.items():
+            if results[index] is not None:
+                continue
+            try:
+                results[index] = self.interpolation_result(data)[0]
+            except Exception as e:
+                results[index] = {'success': False, 'error': str(e)}
+    
+    def shared_grid_groups(self, validated):
+        """
+        Group jobs that only need evaluation_results of a global interpolant on explicit x values,
+        by point count, precision and x values; only groups of two or more jobs are returned
+        """
+        groups = {}
+        for index, data in validated.items():
+            if (data['mode'] != 'global' or data['include'] != ['evaluation'] or data['derivative_order']
+                    or data.get('integral_bounds') or not len(data.get('x_values', []))):
+                continue
+            x_values = np.asarray(data['x_values'], dtype=float)
+            key = (len(data['points']), data['precision'], x_values.tobytes())
+            groups.setdefault(key, []).append(index)
+        return [
+            (indices, [validated[index] for index in indices])
+            for indices in groups.values() if len(indices) > 1
+        ]
+    
+    def evaluate_group(self, group):
+        """Evaluate a group from shared_grid_groups() in one vectorized pass"""
+        nodes = np.asarray([np.asarray(data['points'], dtype=float) for data in group])
+        dtype = resolve_precision(group[0]['precision'])
+        x_values = np.asarray(group[0]['x_values'], dtype=float)
+        y_values = evaluate_many(nodes[:, :, 0], nodes[:, :, 1], x_values, dtype)
+        
+        results = []
+        for data, row in zip(group, y_values):
+            points = data['points']
+            if not isinstance(points, np.ndarray):
+                points = [(p[0], p[1]) for p in points]
+            results.append({
                 'success': True,
-                'coefficients': coefficients,
-                'evaluation_points': x_values if isinstance(x_values, list) else x_values.tolist(),
-                'evaluation_results': y_values,
-                'animation_data': animation_data,
-                'lagrange_terms_details': lagrange_terms_details,
+                'basis': data['basis'],
+                # Requested x values are returned unchanged, as for single jobs
+                'evaluation_points': x_values,
+                'evaluation_results': row,
+                'precision': dtype.name,
                 'original_points': points,
                 'polynomial_degree': len(points) - 1
             })
-            
-        except Exception as e:
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return results
 
 @method_decorator(csrf_exempt, name='dispatch')
 class OdooIntegrationView(APIView):
@@ -102,7 +102,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Add WhiteNoise for static files
+    'lagrange_project.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise for static files, ASGI-capable
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -302,12 +302,58 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'interpolation_app.renderers.ArrayJSONRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20
 }
 
+# In-process LRU cache of built interpolators (per worker process)
+INTERPOLATOR_CACHE = {
+    'MAX_ENTRIES': config('INTERPOLATOR_CACHE_MAX_ENTRIES', default=256, cast=int),
+    'LIVE_MAX_ENTRIES': config('INTERPOLATOR_CACHE_LIVE_MAX_ENTRIES', default=128, cast=int),
+    'MAX_BYTES': config('INTERPOLATOR_CACHE_MAX_BYTES', default=64 * 1024 * 1024, cast=int),
+}
+
+# Cache backends (local memory by default; point CACHE_BACKEND/CACHE_LOCATION at
+# file-based, memcached or redis backends in production)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='lagrange-interpolation'),
+    }
+}
+
+# Opt-in cache of rendered /api/interpolate/ responses
+INTERPOLATION_RESPONSE_CACHE = {
+    'ENABLED': config('INTERPOLATION_RESPONSE_CACHE', default=False, cast=bool),
+    'ALIAS': config('INTERPOLATION_RESPONSE_CACHE_ALIAS', default='default'),
+    'TIMEOUT': config('INTERPOLATION_RESPONSE_CACHE_TIMEOUT', default=300, cast=int),
+    'MAX_BYTES': config('INTERPOLATION_RESPONSE_CACHE_MAX_BYTES', default=1024 * 1024, cast=int),
+}
+
+# Executor running the numeric work of the async interpolation views
+# ('thread' or 'process'; MAX_WORKERS bounds the concurrent computations per worker process)
+ASYNC_INTERPOLATION = {
+    'EXECUTOR': config('ASYNC_INTERPOLATION_EXECUTOR', default='thread'),
+    'MAX_WORKERS': config('ASYNC_INTERPOLATION_MAX_WORKERS', default=4, cast=int),
+}
+
+# Admission control for interpolation requests (costs approximate floating-point operations:
+# n^2 for weights/coefficients, n*m for evaluating m points). Requests up to LIGHT_MAX_COST run
+# immediately; heavier ones share HEAVY_CONCURRENCY slots per process (429 with Retry-After when
+# none frees up within HEAVY_TIMEOUT seconds); requests over MAX_COST, or whose non-streamed
+# response would carry more than MAX_RESPONSE_VALUES numbers, are rejected with 413
+INTERPOLATION_ADMISSION = {
+    'ENABLED': config('INTERPOLATION_ADMISSION', default=True, cast=bool),
+    'LIGHT_MAX_COST': config('INTERPOLATION_LIGHT_MAX_COST', default=1e8, cast=float),
+    'MAX_COST': config('INTERPOLATION_MAX_COST', default=1e10, cast=float),
+    'HEAVY_CONCURRENCY': config('INTERPOLATION_HEAVY_CONCURRENCY', default=2, cast=int),
+    'HEAVY_TIMEOUT': config('INTERPOLATION_HEAVY_TIMEOUT', default=0.0, cast=float),
+    'COST_PER_SECOND': config('INTERPOLATION_COST_PER_SECOND', default=2e8, cast=float),
+    'MAX_RESPONSE_VALUES': config('INTERPOLATION_MAX_RESPONSE_VALUES', default=1e6, cast=float),
+}
+
 # Static files configuration (simplified for Vercel)
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')